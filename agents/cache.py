@@ -0,0 +1,120 @@
+"""
+In-process caches shared by the agents.
+"""
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class WReciprocalCache:
+    """Size-bounded cache that evicts by cost per byte (WReciprocal policy).
+
+    Every entry records how expensive it was to produce (e.g. fetch latency)
+    and how much space it takes. When the cache is over budget, the entry
+    with the lowest cost/size ratio is evicted first, so cheap-to-refetch
+    bulky responses go before expensive small ones.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: Dict[Hashable, Tuple[Any, int, int]] = {}
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._counter = itertools.count()
+        self._total_size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for key, or default."""
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else default
+
+    def put(self, key: Hashable, value: Any, cost: float, size: int) -> None:
+        """Store value under key, evicting low cost/size entries if needed."""
+        self.discard(key)
+        size = max(size, 1)
+        if size > self.max_size:
+            return
+
+        version = next(self._counter)
+        self._entries[key] = (value, size, version)
+        self._total_size += size
+        heapq.heappush(self._heap, (cost / size, version, key))
+
+        while self._total_size > self.max_size:
+            self._evict_one()
+
+        # Re-puts under budget never evict, so superseded records are compacted here
+        if len(self._heap) > 2 * len(self._entries):
+            self._compact()
+
+    def discard(self, key: Hashable) -> None:
+        """Remove key from the cache if present."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_size -= entry[1]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._heap.clear()
+        self._total_size = 0
+
+    def _compact(self) -> None:
+        """Drop the heap records of replaced or discarded entries."""
+        self._heap = [record for record in self._heap if self._is_live(record)]
+        heapq.heapify(self._heap)
+
+    def _is_live(self, record: Tuple[float, int, Hashable]) -> bool:
+        """Whether a heap record belongs to the current entry for its key."""
+        entry = self._entries.get(record[2])
+        return entry is not None and entry[2] == record[1]
+
+    def _evict_one(self) -> None:
+        """Evict the live entry with the lowest cost/size ratio."""
+        while self._heap:
+            record = heapq.heappop(self._heap)
+            # Heap records of replaced or discarded entries are skipped lazily
+            if self._is_live(record):
+                self.discard(record[2])
+                return
+
+
+class TTLCache:
+    """LRU cache whose entries also expire a fixed number of seconds after insertion."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the live value for key, or default if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entries if full."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
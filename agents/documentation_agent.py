@@ -1,17 +1,68 @@
 """
 Documentation Retrieval Agent for fetching and processing documentation.
 """
-import asyncio
-import aiohttp
 import re
-from typing import Dict, List, Optional, Any
+from collections import Counter
+from typing import Dict, List, Optional, Any, Tuple, Union
 from langchain.tools import BaseTool
 from langchain.schema import BaseMessage, HumanMessage, AIMessage
 from pydantic import BaseModel, Field
 from bs4 import BeautifulSoup
+from lxml import etree
 import markdown
 
+from .event_loop import run_sync
+from .http_client import get_session
 
+
+_HEADER_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+_MD_HEADER_RE = re.compile(r'^#+(.*)$', re.MULTILINE)
+
+# Section-type keywords in priority order; the first type with a matching keyword wins
+_SECTION_TYPE_KEYWORDS = (
+    ('installation', ('install', 'setup', 'getting started')),
+    ('usage', ('usage', 'example', 'tutorial', 'guide')),
+    ('api', ('api', 'reference', 'method', 'function')),
+    ('configuration', ('config', 'configuration', 'settings')),
+    ('troubleshooting', ('troubleshoot', 'faq', 'common issues')),
+)
+_KEYWORD_TO_TYPE = {
+    keyword: section_type
+    for section_type, keywords in _SECTION_TYPE_KEYWORDS
+    for keyword in keywords
+}
+_TYPE_PRIORITY = {section_type: rank for rank, (section_type, _) in enumerate(_SECTION_TYPE_KEYWORDS)}
+# Zero-width lookahead so overlapping keywords are all reported in one scan
+_SECTION_KEYWORD_RE = re.compile('(?=(' + '|'.join(map(re.escape, _KEYWORD_TO_TYPE)) + '))')
+
+
+# Extraction patterns, compiled once at import
+# Numbered ("1.") or bulleted ("- ", "* ") lines, captured without surrounding whitespace
+_STEP_RE = re.compile(r'^[^\S\n]*((?:\d+\.|[-*] [^\S\n]*\S).*?)[^\S\n]*$', re.MULTILINE)
+# Fenced code blocks or inline code, in document order
+_CODE_RE = re.compile(r'```[\s\S]*?```|`[^`]+`')
+# Function/method signatures or class declarations, in document order
+_API_RE = re.compile(r'(?:def|function|method)\s+\w+\([^)]*\)|class\s+\w+', re.IGNORECASE)
+_KV_RE = re.compile(r'(\w+)\s*[:=]\s*([^\n]+)')
+_URL_RE = re.compile(r'https?://[^\s]+')
+
+# Section type -> (key_info bucket, DocumentationAgent extractor method)
+_SECTION_EXTRACTORS = {
+    'installation': ('installation_steps', '_extract_steps'),
+    'usage': ('usage_examples', '_extract_code_examples'),
+    'api': ('api_references', '_extract_api_references'),
+    'configuration': ('configuration_options', '_extract_configuration_options'),
+}
+
+# Documentation bodies are streamed into the HTML parser in 64KB chunks
+_FETCH_CHUNK_SIZE = 65536
+_MARKDOWN_CONTENT_TYPES = frozenset(('text/markdown', 'text/x-markdown'))
+_HTML_CONTENT_TYPES = frozenset(('text/html', 'application/xhtml+xml'))
+# Bodies of any other type are sniffed for a "markdown" mention in this many characters
+_SNIFF_SIZE = 4096
+
+
+# Built only by the parsers below, via .construct() without validation
 class DocumentationSection(BaseModel):
     """Model for documentation sections."""
     title: str
@@ -32,105 +83,133 @@ class DocumentationAgent:
     
     async def fetch_documentation(self, url: str) -> str:
         """Fetch documentation content from a URL."""
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    return content
-                else:
-                    raise Exception(f"Failed to fetch documentation: {response.status}")
+        session = await get_session()
+        async with session.get(url, headers=self.headers) as response:
+            if response.status == 200:
+                content = await response.text()
+                return content
+            else:
+                raise Exception(f"Failed to fetch documentation: {response.status}")
+    
+    async def fetch_and_parse_documentation(self, url: str) -> List[DocumentationSection]:
+        """Fetch documentation and parse it into sections.
+
+        The format comes from the URL suffix, then the Content-Type, and only
+        then from sniffing the start of the body. HTML is fed to lxml chunk by
+        chunk as it arrives, so parsing overlaps with the download.
+        """
+        if url.endswith('.md'):
+            return self.parse_markdown_documentation(await self.fetch_documentation(url), url)
+
+        session = await get_session()
+        async with session.get(url, headers=self.headers) as response:
+            if response.status != 200:
+                raise Exception(f"Failed to fetch documentation: {response.status}")
+
+            if response.content_type in _MARKDOWN_CONTENT_TYPES:
+                return self.parse_markdown_documentation(await response.text(), url)
+
+            if response.content_type not in _HTML_CONTENT_TYPES:
+                content = await response.text()
+                if 'markdown' in content[:_SNIFF_SIZE].lower():
+                    return self.parse_markdown_documentation(content, url)
+                return self.parse_html_documentation(content, url)
+
+            # Use the header charset if there is one; otherwise leave it to lxml,
+            # which honours a BOM or <meta charset> in the document itself
+            parser = etree.HTMLParser(encoding=response.charset)
+            async for chunk in response.content.iter_chunked(_FETCH_CHUNK_SIZE):
+                parser.feed(chunk)
+
+        try:
+            root = parser.close()
+        except etree.XMLSyntaxError:
+            # Nothing was fed, e.g. an empty body
+            root = None
+        return self.parse_html_documentation(root, url)
     
     def parse_markdown_documentation(self, content: str, base_url: str = "") -> List[DocumentationSection]:
         """Parse markdown documentation into structured sections."""
         sections = []
-        
-        # Split content by headers
-        lines = content.split('\n')
-        current_section = None
-        current_content = []
-        
-        for line in lines:
-            # Check if line is a header
-            if line.startswith('#'):
-                # Save previous section if exists
-                if current_section:
-                    sections.append(DocumentationSection(
-                        title=current_section,
-                        content='\n'.join(current_content).strip(),
-                        url=base_url,
-                        section_type=self._classify_section_type(current_section)
-                    ))
-                
-                # Start new section
-                current_section = line.lstrip('#').strip()
-                current_content = []
-            else:
-                current_content.append(line)
-        
-        # Add the last section
-        if current_section:
-            sections.append(DocumentationSection(
-                title=current_section,
-                content='\n'.join(current_content).strip(),
-                url=base_url,
-                section_type=self._classify_section_type(current_section)
-            ))
-        
+        headers = list(_MD_HEADER_RE.finditer(content))
+
+        # Each body is sliced from the end of its header line to the next header
+        body_ends = [header.start() for header in headers[1:]]
+        body_ends.append(len(content))
+
+        for header, body_end in zip(headers, body_ends):
+            title = header.group(1).strip()
+            # Headers without a title are dropped along with their body
+            if title:
+                sections.append(DocumentationSection.construct(
+                    title=title,
+                    content=content[header.end():body_end].strip(),
+                    url=base_url,
+                    section_type=self._classify_section_type(title)
+                ))
+
         return sections
     
-    def parse_html_documentation(self, content: str, base_url: str = "") -> List[DocumentationSection]:
-        """Parse HTML documentation into structured sections."""
-        soup = BeautifulSoup(content, 'html.parser')
+    def parse_html_documentation(self, content: Union[str, etree._Element, None], base_url: str = "") -> List[DocumentationSection]:
+        """Parse HTML documentation, given as markup or an already parsed tree, into structured sections."""
         sections = []
-        
-        # Find all headers (h1, h2, h3, etc.)
-        headers = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-        
-        for header in headers:
-            title = header.get_text().strip()
-            
-            # Get content until next header
-            content_elements = []
-            current = header.next_sibling
-            
-            while current and current.name not in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                if hasattr(current, 'get_text'):
-                    content_elements.append(current.get_text())
-                elif isinstance(current, str):
-                    content_elements.append(current)
-                current = current.next_sibling
-            
-            content_text = '\n'.join(content_elements).strip()
-            
-            sections.append(DocumentationSection(
+
+        if isinstance(content, str):
+            root = etree.fromstring(content.encode('utf-8'), etree.HTMLParser(encoding='utf-8'))
+        else:
+            root = content
+        if root is None:
+            return sections
+
+        # Single in-order pass: all text after a header (h1, h2, h3, etc.)
+        # belongs to it until the next header starts
+        title = None
+        header = None
+        content_elements = []
+
+        for event, element in etree.iterwalk(root, events=('start', 'end')):
+            if event == 'start':
+                if header is None and element.tag in _HEADER_TAGS:
+                    # Save previous section if exists
+                    if title is not None:
+                        sections.append(DocumentationSection.construct(
+                            title=title,
+                            content=''.join(content_elements).strip(),
+                            url=base_url,
+                            section_type=self._classify_section_type(title)
+                        ))
+
+                    # Start new section
+                    title = ''.join(element.itertext()).strip()
+                    header = element
+                    content_elements = []
+                elif header is None and title is not None and isinstance(element.tag, str) and element.text:
+                    content_elements.append(element.text)
+            else:
+                if element is header:
+                    header = None
+                if header is None and title is not None and element.tail:
+                    content_elements.append(element.tail)
+
+        # Add the last section
+        if title is not None:
+            sections.append(DocumentationSection.construct(
                 title=title,
-                content=content_text,
+                content=''.join(content_elements).strip(),
                 url=base_url,
                 section_type=self._classify_section_type(title)
             ))
-        
+
         return sections
     
     def _classify_section_type(self, title: str) -> str:
         """Classify section type based on title."""
-        title_lower = title.lower()
-        
-        if any(word in title_lower for word in ['install', 'setup', 'getting started']):
-            return 'installation'
-        elif any(word in title_lower for word in ['usage', 'example', 'tutorial', 'guide']):
-            return 'usage'
-        elif any(word in title_lower for word in ['api', 'reference', 'method', 'function']):
-            return 'api'
-        elif any(word in title_lower for word in ['config', 'configuration', 'settings']):
-            return 'configuration'
-        elif any(word in title_lower for word in ['troubleshoot', 'faq', 'common issues']):
-            return 'troubleshooting'
-        else:
-            return 'general'
+        matched_types = {_KEYWORD_TO_TYPE[keyword] for keyword in _SECTION_KEYWORD_RE.findall(title.lower())}
+        return min(matched_types, key=_TYPE_PRIORITY.__getitem__, default='general')
     
     def extract_meaningful_content(self, content: str) -> str:
         """Extract meaningful content from documentation instead of just counting sections."""
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = BeautifulSoup(content, 'lxml')
         
         # Extract key information that developers actually care about
         meaningful_content = []
@@ -186,124 +265,82 @@ class DocumentationAgent:
         }
         
         for section in sections:
-            if section.section_type == 'installation':
-                # Extract installation steps
-                steps = self._extract_steps(section.content)
-                key_info['installation_steps'].extend(steps)
-            
-            elif section.section_type == 'usage':
-                # Extract code examples
-                examples = self._extract_code_examples(section.content)
-                key_info['usage_examples'].extend(examples)
-            
-            elif section.section_type == 'api':
-                # Extract API references
-                api_refs = self._extract_api_references(section.content)
-                key_info['api_references'].extend(api_refs)
-            
-            elif section.section_type == 'configuration':
-                # Extract configuration options
-                config_options = self._extract_configuration_options(section.content)
-                key_info['configuration_options'].extend(config_options)
+            scanned = self._scan_section(section)
+            if scanned is not None:
+                bucket, items = scanned
+                key_info[bucket].extend(items)
         
         return key_info
     
+    def _scan_section(self, section: DocumentationSection) -> Optional[Tuple[str, List[str]]]:
+        """Run the extractor for a section's type, returning (bucket, items) or None."""
+        extractor = _SECTION_EXTRACTORS.get(section.section_type)
+        if extractor is None:
+            return None
+        bucket, method_name = extractor
+        return bucket, getattr(self, method_name)(section.content)
+    
     def _extract_steps(self, content: str) -> List[str]:
         """Extract numbered or bulleted steps from content."""
-        steps = []
-        lines = content.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if re.match(r'^\d+\.', line) or line.startswith('- ') or line.startswith('* '):
-                steps.append(line)
-        
-        return steps
+        return _STEP_RE.findall(content)
     
     def _extract_code_examples(self, content: str) -> List[str]:
-        """Extract code examples from content."""
-        examples = []
-        
-        # Look for code blocks
-        code_blocks = re.findall(r'```[\s\S]*?```', content)
-        examples.extend(code_blocks)
-        
-        # Look for inline code
-        inline_code = re.findall(r'`[^`]+`', content)
-        examples.extend(inline_code)
-        
-        return examples
+        """Extract code blocks and inline code from content."""
+        return _CODE_RE.findall(content)
     
     def _extract_api_references(self, content: str) -> List[str]:
-        """Extract API references from content."""
-        api_refs = []
-        
-        # Look for function/method definitions
-        functions = re.findall(r'(?:def|function|method)\s+\w+\([^)]*\)', content, re.IGNORECASE)
-        api_refs.extend(functions)
-        
-        # Look for class definitions
-        classes = re.findall(r'class\s+\w+', content, re.IGNORECASE)
-        api_refs.extend(classes)
-        
-        return api_refs
+        """Extract function and class references from content."""
+        return _API_RE.findall(content)
     
     def _extract_configuration_options(self, content: str) -> List[str]:
         """Extract configuration options from content."""
         config_options = []
         
         # Look for key-value pairs
-        kv_pairs = re.findall(r'(\w+)\s*[:=]\s*([^\n]+)', content)
+        kv_pairs = _KV_RE.findall(content)
         config_options.extend([f"{k}: {v}" for k, v in kv_pairs])
         
         return config_options
     
     def format_documentation_summary(self, sections: List[DocumentationSection], key_info: Dict[str, Any]) -> str:
         """Format documentation into a comprehensive summary."""
-        summary = "## Documentation Analysis\n\n"
+        parts = ["## Documentation Analysis\n\n"]
         
         # Overview
-        summary += f"**Total Sections Found:** {len(sections)}\n\n"
+        parts.append(f"**Total Sections Found:** {len(sections)}\n\n")
         
         # Section breakdown
-        section_types = {}
-        for section in sections:
-            section_types[section.section_type] = section_types.get(section.section_type, 0) + 1
+        section_types = Counter(section.section_type for section in sections)
         
-        summary += "**Section Types:**\n"
-        for section_type, count in section_types.items():
-            summary += f"- {section_type.title()}: {count} sections\n"
-        summary += "\n"
+        # Most frequent types first; ties keep the order they were first seen
+        parts.append("**Section Types:**\n")
+        parts.extend(f"- {section_type.title()}: {count} sections\n" for section_type, count in section_types.most_common())
+        parts.append("\n")
         
         # Key information
         if key_info['installation_steps']:
-            summary += "**Installation Steps:**\n"
-            for step in key_info['installation_steps'][:5]:  # Limit to first 5
-                summary += f"- {step}\n"
-            summary += "\n"
+            parts.append("**Installation Steps:**\n")
+            parts.extend(f"- {step}\n" for step in key_info['installation_steps'][:5])  # Limit to first 5
+            parts.append("\n")
         
         if key_info['usage_examples']:
-            summary += "**Usage Examples:**\n"
-            for example in key_info['usage_examples'][:3]:  # Limit to first 3
-                summary += f"```\n{example}\n```\n"
-            summary += "\n"
+            parts.append("**Usage Examples:**\n")
+            parts.extend(f"```\n{example}\n```\n" for example in key_info['usage_examples'][:3])  # Limit to first 3
+            parts.append("\n")
         
         if key_info['api_references']:
-            summary += "**API References:**\n"
-            for api_ref in key_info['api_references'][:5]:  # Limit to first 5
-                summary += f"- {api_ref}\n"
-            summary += "\n"
+            parts.append("**API References:**\n")
+            parts.extend(f"- {api_ref}\n" for api_ref in key_info['api_references'][:5])  # Limit to first 5
+            parts.append("\n")
         
         # Detailed sections
-        summary += "**Detailed Sections:**\n"
+        parts.append("**Detailed Sections:**\n")
         for section in sections[:10]:  # Limit to first 10 sections
-            summary += f"### {section.title}\n"
-            summary += f"*Type: {section.section_type}*\n\n"
             # Truncate content for readability
             content_preview = section.content[:200] + "..." if len(section.content) > 200 else section.content
-            summary += f"{content_preview}\n\n"
+            parts.append(f"### {section.title}\n*Type: {section.section_type}*\n\n{content_preview}\n\n")
         
-        return summary
+        return ''.join(parts)
 
 
 class DocumentationTool(BaseTool):
@@ -319,26 +356,20 @@ class DocumentationTool(BaseTool):
     
     def _run(self, query: str) -> str:
         """Synchronous wrapper for documentation operations."""
-        return asyncio.run(self._arun(query))
+        return run_sync(self._arun(query))
     
     async def _arun(self, query: str) -> str:
         """Asynchronous documentation operations."""
         try:
             # Extract URL from query
-            url_match = re.search(r'https?://[^\s]+', query)
+            url_match = _URL_RE.search(query)
             if not url_match:
                 return "Please provide a valid URL in your query."
             
             url = url_match.group(0)
             
-            # Fetch documentation
-            content = await self.agent.fetch_documentation(url)
-            
-            # Determine if it's HTML or Markdown
-            if url.endswith('.md') or 'markdown' in content.lower():
-                sections = self.agent.parse_markdown_documentation(content, url)
-            else:
-                sections = self.agent.parse_html_documentation(content, url)
+            # Fetch and parse documentation as HTML or Markdown
+            sections = await self.agent.fetch_and_parse_documentation(url)
             
             # Extract key information
             key_info = self.agent.extract_key_information(sections)
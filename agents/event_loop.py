@@ -0,0 +1,43 @@
+"""
+Persistent background event loop for the tools' synchronous entry points.
+
+asyncio.run() creates and tears down a loop on every call, which also strands
+the shared aiohttp session bound to that loop. Synchronous tool calls are
+instead submitted to one long-lived loop on a daemon thread, so the session
+and its pooled connections stay warm between calls.
+"""
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the background loop, starting its thread on first use."""
+    global _loop
+
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="agents-event-loop", daemon=True).start()
+    return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the background loop and block until it completes."""
+    loop = get_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        # Blocking on our own loop would never return
+        coro.close()
+        raise RuntimeError("run_sync() cannot be called from the background event loop")
+
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
@@ -2,13 +2,19 @@
 GitHub API Agent for repository analysis and data retrieval.
 """
 import asyncio
-import aiohttp
-import json
-from typing import Dict, List, Optional, Any
+import copy
+import time
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Any
+import orjson
 from langchain.tools import BaseTool
 from langchain.schema import BaseMessage, HumanMessage, AIMessage
 from pydantic import BaseModel, Field
 
+from .cache import WReciprocalCache
+from .event_loop import run_sync
+from .http_client import get_session
+
 
 class GitHubRepositoryInfo(BaseModel):
     """Model for GitHub repository information."""
@@ -31,6 +37,95 @@ class GitHubIssuesInfo(BaseModel):
     recent_issues: List[Dict[str, Any]] = Field(default_factory=list)
 
 
+_label_name = itemgetter("name")
+
+
+# GitHub API payloads are trusted, so the models below are built with
+# .construct() and skip pydantic's per-field validation
+def _parse_repository_info(data: Dict[str, Any]) -> GitHubRepositoryInfo:
+    """Build repository info from a /repos/{owner}/{repo} payload."""
+    return GitHubRepositoryInfo.construct(
+        name=data["name"],
+        full_name=data["full_name"],
+        description=data.get("description"),
+        language=data.get("language"),
+        stars=data["stargazers_count"],
+        forks=data["forks_count"],
+        open_issues=data["open_issues_count"],
+        last_updated=data["updated_at"],
+        topics=data.get("topics", [])
+    )
+
+
+def _parse_issues_info(issues: List[Dict[str, Any]]) -> GitHubIssuesInfo:
+    """Build issue statistics from a /repos/{owner}/{repo}/issues payload."""
+    # Count states and format the top 5 recent issues in one pass
+    open_issues = 0
+    recent_issues = []
+    for index, issue in enumerate(issues):
+        if issue["state"] == "open":
+            open_issues += 1
+        if index < 5:
+            # Unlabelled issues share the empty tuple; names are joined once for display
+            labels = issue.get("labels")
+            label_names = tuple(map(_label_name, labels)) if labels else ()
+            recent_issues.append({
+                "title": issue["title"],
+                "state": issue["state"],
+                "created_at": issue["created_at"],
+                "labels": label_names,
+                "labels_str": ', '.join(label_names)
+            })
+
+    total_issues = len(issues)
+    closed_issues = total_issues - open_issues
+
+    return GitHubIssuesInfo.construct(
+        total_issues=total_issues,
+        open_issues=open_issues,
+        closed_issues=closed_issues,
+        recent_issues=recent_issues
+    )
+
+
+def _parse_search_items(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the repository list from a /search/repositories payload."""
+    return data["items"]
+
+
+# Parsed responses shared by all GitHub agents; entries are revalidated with ETags
+_response_cache = WReciprocalCache(max_size=8 * 1024 * 1024)
+
+
+async def _cached_get(url: str, headers: Dict[str, str], params: Optional[Dict[str, Any]],
+                      parse: Callable[[Any], Any], error_message: str) -> Any:
+    """GET a GitHub API URL, reusing the cached parsed result on 304 Not Modified.
+
+    Callers get their own copy, so mutating a result cannot corrupt the cache.
+    """
+    key = (url, tuple(sorted(params.items())) if params else (), headers.get("Authorization"))
+    cached = _response_cache.get(key)
+    if cached is not None:
+        headers = {**headers, "If-None-Match": cached[0]}
+
+    started = time.monotonic()
+    session = await get_session()
+    async with session.get(url, params=params, headers=headers) as response:
+        if response.status == 304 and cached is not None:
+            return copy.deepcopy(cached[1])
+        if response.status != 200:
+            raise Exception(f"{error_message}: {response.status}")
+
+        body = await response.read()
+        result = parse(orjson.loads(body))
+        etag = response.headers.get("ETag")
+        if etag:
+            # Cost is the round-trip we save on a hit, size the payload we hold on to
+            _response_cache.put(key, (etag, result), cost=time.monotonic() - started, size=len(body))
+            return copy.deepcopy(result)
+        return result
+
+
 class GitHubAgent:
     """Agent responsible for GitHub API interactions."""
     
@@ -48,74 +143,28 @@ class GitHubAgent:
         """Fetch comprehensive repository information."""
         url = f"{self.base_url}/repos/{repo_name}"
         
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return GitHubRepositoryInfo(
-                        name=data["name"],
-                        full_name=data["full_name"],
-                        description=data.get("description"),
-                        language=data.get("language"),
-                        stars=data["stargazers_count"],
-                        forks=data["forks_count"],
-                        open_issues=data["open_issues_count"],
-                        last_updated=data["updated_at"],
-                        topics=data.get("topics", [])
-                    )
-                else:
-                    raise Exception(f"Failed to fetch repository info: {response.status}")
+        return await _cached_get(url, self.headers, None, _parse_repository_info,
+                                 "Failed to fetch repository info")
     
     async def get_repository_issues(self, repo_name: str, limit: int = 10) -> GitHubIssuesInfo:
         """Fetch repository issues information."""
         url = f"{self.base_url}/repos/{repo_name}/issues"
         params = {"state": "all", "per_page": limit}
         
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    issues = await response.json()
-                    
-                    # Get total counts
-                    total_issues = len(issues)
-                    open_issues = len([i for i in issues if i["state"] == "open"])
-                    closed_issues = total_issues - open_issues
-                    
-                    # Format recent issues
-                    recent_issues = []
-                    for issue in issues[:5]:  # Get top 5 recent issues
-                        recent_issues.append({
-                            "title": issue["title"],
-                            "state": issue["state"],
-                            "created_at": issue["created_at"],
-                            "labels": [label["name"] for label in issue.get("labels", [])]
-                        })
-                    
-                    return GitHubIssuesInfo(
-                        total_issues=total_issues,
-                        open_issues=open_issues,
-                        closed_issues=closed_issues,
-                        recent_issues=recent_issues
-                    )
-                else:
-                    raise Exception(f"Failed to fetch issues: {response.status}")
+        return await _cached_get(url, self.headers, params, _parse_issues_info,
+                                 "Failed to fetch issues")
     
     async def search_repositories(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Search for repositories based on query."""
         url = f"{self.base_url}/search/repositories"
         params = {"q": query, "per_page": limit, "sort": "stars"}
         
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data["items"]
-                else:
-                    raise Exception(f"Failed to search repositories: {response.status}")
+        return await _cached_get(url, self.headers, params, _parse_search_items,
+                                 "Failed to search repositories")
     
     def format_repository_summary(self, repo_info: GitHubRepositoryInfo, issues_info: GitHubIssuesInfo) -> str:
         """Format repository information into a readable summary."""
-        summary = f"""
+        parts = [f"""
 ## Repository Analysis: {repo_info.full_name}
 
 **Basic Information:**
@@ -131,17 +180,17 @@ class GitHubAgent:
 - Closed Issues: {issues_info.closed_issues}
 
 **Recent Issues:**
-"""
-        
+"""]
+
         for issue in issues_info.recent_issues:
-            summary += f"- **{issue['title']}** ({issue['state']}) - {issue['created_at']}\n"
-            if issue['labels']:
-                summary += f"  Labels: {', '.join(issue['labels'])}\n"
-        
+            parts.append(f"- **{issue['title']}** ({issue['state']}) - {issue['created_at']}\n")
+            if issue['labels_str']:
+                parts.append(f"  Labels: {issue['labels_str']}\n")
+
         if repo_info.topics:
-            summary += f"\n**Topics:** {', '.join(repo_info.topics)}\n"
-        
-        return summary
+            parts.append(f"\n**Topics:** {', '.join(repo_info.topics)}\n")
+
+        return ''.join(parts)
 
 
 class GitHubTool(BaseTool):
@@ -149,155 +198,52 @@ class GitHubTool(BaseTool):
     
     name = "github_analyzer"
     description = "Analyze GitHub repositories, fetch issues, and search for repositories"
-    github_token: Optional[str] = Field(default=None)
-    base_url: str = Field(default="https://api.github.com")
-    headers: Dict[str, str] = Field(default_factory=dict)
+    agent: GitHubAgent = Field(default=None)
     
     def __init__(self, github_token: Optional[str] = None):
         super().__init__()
-        self.github_token = github_token
-        self.base_url = "https://api.github.com"
-        self.headers = {
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "AgenticWorkflowDemo/1.0"
-        }
-        if github_token:
-            self.headers["Authorization"] = f"token {github_token}"
+        self.agent = GitHubAgent(github_token)
     
     def _run(self, query: str) -> str:
         """Synchronous wrapper for GitHub operations."""
-        return asyncio.run(self._arun(query))
+        return run_sync(self._arun(query))
     
     async def _arun(self, query: str) -> str:
         """Asynchronous GitHub operations."""
         try:
             # Parse the query to determine operation
-            if "repo:" in query.lower():
+            query_lower = query.lower()
+            if "repo:" in query_lower:
                 # Extract repository name
                 repo_name = query.split("repo:")[-1].strip()
                 
-                # Fetch repository info and issues
-                repo_info = await self.get_repository_info(repo_name)
-                issues_info = await self.get_repository_issues(repo_name)
+                # Fetch repository info and issues concurrently
+                repo_info, issues_info = await asyncio.gather(
+                    self.agent.get_repository_info(repo_name),
+                    self.agent.get_repository_issues(repo_name)
+                )
                 
-                return self.format_repository_summary(repo_info, issues_info)
+                return self.agent.format_repository_summary(repo_info, issues_info)
             
-            elif "search:" in query.lower():
+            elif "search:" in query_lower:
                 # Extract search query
                 search_query = query.split("search:")[-1].strip()
                 
                 # Search repositories
-                results = await self.search_repositories(search_query)
-                
-                summary = f"## Search Results for '{search_query}':\n\n"
-                for repo in results:
-                    summary += f"- **{repo['full_name']}** ({repo['stargazers_count']} stars)\n"
-                    summary += f"  {repo.get('description', 'No description')}\n"
-                    summary += f"  Language: {repo.get('language', 'Not specified')}\n\n"
+                results = await self.agent.search_repositories(search_query)
                 
-                return summary
+                parts = [f"## Search Results for '{search_query}':\n\n"]
+                parts.extend(
+                    f"- **{repo['full_name']}** ({repo['stargazers_count']} stars)\n"
+                    f"  {repo.get('description', 'No description')}\n"
+                    f"  Language: {repo.get('language', 'Not specified')}\n\n"
+                    for repo in results
+                )
+
+                return ''.join(parts)
             
             else:
                 return "Please specify either 'repo:repository_name' or 'search:query' in your request."
                 
         except Exception as e:
             return f"Error: {str(e)}"
-    
-    async def get_repository_info(self, repo_name: str) -> GitHubRepositoryInfo:
-        """Fetch comprehensive repository information."""
-        url = f"{self.base_url}/repos/{repo_name}"
-        
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return GitHubRepositoryInfo(
-                        name=data["name"],
-                        full_name=data["full_name"],
-                        description=data.get("description"),
-                        language=data.get("language"),
-                        stars=data["stargazers_count"],
-                        forks=data["forks_count"],
-                        open_issues=data["open_issues_count"],
-                        last_updated=data["updated_at"],
-                        topics=data.get("topics", [])
-                    )
-                else:
-                    raise Exception(f"Failed to fetch repository info: {response.status}")
-    
-    async def get_repository_issues(self, repo_name: str, limit: int = 10) -> GitHubIssuesInfo:
-        """Fetch repository issues information."""
-        url = f"{self.base_url}/repos/{repo_name}/issues"
-        params = {"state": "all", "per_page": limit}
-        
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    issues = await response.json()
-                    
-                    # Get total counts
-                    total_issues = len(issues)
-                    open_issues = len([i for i in issues if i["state"] == "open"])
-                    closed_issues = total_issues - open_issues
-                    
-                    # Format recent issues
-                    recent_issues = []
-                    for issue in issues[:5]:  # Get top 5 recent issues
-                        recent_issues.append({
-                            "title": issue["title"],
-                            "state": issue["state"],
-                            "created_at": issue["created_at"],
-                            "labels": [label["name"] for label in issue.get("labels", [])]
-                        })
-                    
-                    return GitHubIssuesInfo(
-                        total_issues=total_issues,
-                        open_issues=open_issues,
-                        closed_issues=closed_issues,
-                        recent_issues=recent_issues
-                    )
-                else:
-                    raise Exception(f"Failed to fetch issues: {response.status}")
-    
-    async def search_repositories(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
-        """Search for repositories based on query."""
-        url = f"{self.base_url}/search/repositories"
-        params = {"q": query, "per_page": limit, "sort": "stars"}
-        
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data["items"]
-                else:
-                    raise Exception(f"Failed to search repositories: {response.status}")
-    
-    def format_repository_summary(self, repo_info: GitHubRepositoryInfo, issues_info: GitHubIssuesInfo) -> str:
-        """Format repository information into a readable summary."""
-        summary = f"""
-## Repository Analysis: {repo_info.full_name}
-
-**Basic Information:**
-- Description: {repo_info.description or "No description available"}
-- Primary Language: {repo_info.language or "Not specified"}
-- Stars: {repo_info.stars:,}
-- Forks: {repo_info.forks:,}
-- Last Updated: {repo_info.last_updated}
-
-**Issues Overview:**
-- Total Issues: {issues_info.total_issues}
-- Open Issues: {issues_info.open_issues}
-- Closed Issues: {issues_info.closed_issues}
-
-**Recent Issues:**
-"""
-        
-        for issue in issues_info.recent_issues:
-            summary += f"- **{issue['title']}** ({issue['state']}) - {issue['created_at']}\n"
-            if issue['labels']:
-                summary += f"  Labels: {', '.join(issue['labels'])}\n"
-        
-        if repo_info.topics:
-            summary += f"\n**Topics:** {', '.join(repo_info.topics)}\n"
-        
-        return summary
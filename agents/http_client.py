@@ -0,0 +1,135 @@
+"""
+Shared HTTP client for the agents.
+
+A single pooled aiohttp session is reused across all GitHub and documentation
+fetches so repeated requests skip the TCP + TLS handshake. OpenAI calls share
+one httpx transport that pools connections the same way, and that can charge
+every request to a rate limiter.
+"""
+import asyncio
+import atexit
+from typing import Any, Coroutine, Dict, List, Optional
+
+import aiohttp
+import httpx
+
+from .rate_limit import AsyncTokenBucket
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "AgenticWorkflowDemo/1.0"
+}
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the shared client session, creating it lazily on first use."""
+    global _session, _session_loop
+
+    loop = asyncio.get_running_loop()
+    # aiohttp sessions are bound to the loop they were created on
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=10, enable_cleanup_closed=True),
+            timeout=aiohttp.ClientTimeout(total=60, connect=10),
+            headers=DEFAULT_HEADERS
+        )
+        _session_loop = loop
+    return _session
+
+
+class _PerLoopTransport(httpx.AsyncBaseTransport):
+    """httpx transport that keeps a separate connection pool for each event loop.
+
+    Like aiohttp sessions, httpx pools are bound to the loop that opened their
+    connections, and the same client is used both from the caller's loop and
+    from the tools' background loop (see event_loop.run_sync).
+    """
+
+    def __init__(self, limits: httpx.Limits):
+        self._limits = limits
+        self._pools: Dict[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport] = {}
+        # Every request, retries included, takes a token when set
+        self.limiter: Optional[AsyncTokenBucket] = None
+
+    def _pool(self) -> httpx.AsyncHTTPTransport:
+        """Return the running loop's pool, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            # Pools of loops that have since closed can be neither used nor closed
+            for stale_loop in [known for known in self._pools if known.is_closed()]:
+                del self._pools[stale_loop]
+            pool = self._pools[loop] = httpx.AsyncHTTPTransport(limits=self._limits)
+        return pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.limiter is not None:
+            await self.limiter.acquire()
+        return await self._pool().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Close the running loop's pool; other loops keep theirs."""
+        pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.aclose()
+
+    def open_loops(self) -> List[asyncio.AbstractEventLoop]:
+        """Loops that still hold a pool and can run its close."""
+        return [loop for loop in self._pools if not loop.is_closed()]
+
+
+_llm_transport = _PerLoopTransport(httpx.Limits(max_connections=100, max_keepalive_connections=50))
+_llm_rate: Optional[float] = None
+
+
+def get_llm_transport() -> httpx.AsyncBaseTransport:
+    """Return the transport shared by every pooled OpenAI client."""
+    return _llm_transport
+
+
+def set_llm_rate_limit(requests_per_minute: Optional[float]) -> None:
+    """Cap the OpenAI requests sent through the shared transport, or lift the cap with None.
+    
+    Setting the rate already in force keeps the current bucket and its tokens.
+    """
+    global _llm_rate
+
+    if requests_per_minute == _llm_rate:
+        return
+    _llm_transport.limiter = AsyncTokenBucket(requests_per_minute) if requests_per_minute is not None else None
+    _llm_rate = requests_per_minute
+
+
+async def close_session() -> None:
+    """Close the shared client session and the running loop's OpenAI pool if they are open."""
+    global _session, _session_loop
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
+    await _llm_transport.aclose()
+
+
+def _run_on_loop(loop: asyncio.AbstractEventLoop, coro: Coroutine[Any, Any, None]) -> None:
+    """Run coro on loop, whether it is idle or running on another thread."""
+    if loop.is_running():
+        # The loop lives on another thread; hand the close over to it
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        future.result(timeout=5)
+    else:
+        loop.run_until_complete(coro)
+
+
+def _close_session_at_exit() -> None:
+    """Close the shared pools on interpreter shutdown where their loops are still usable."""
+    if _session is not None and not _session.closed and _session_loop is not None and not _session_loop.is_closed():
+        _run_on_loop(_session_loop, close_session())
+    for loop in _llm_transport.open_loops():
+        _run_on_loop(loop, _llm_transport.aclose())
+
+
+atexit.register(_close_session_at_exit)
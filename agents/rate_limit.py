@@ -0,0 +1,64 @@
+"""
+Client-side rate limiting for model requests.
+
+Fanned-out workflows can fire bursts that trip the provider's requests-per-minute
+limit, and every 429 costs a retry backoff. Requests instead wait for a token
+from a bucket refilled at the configured rate, so the burst is smoothed out
+before it reaches the API.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class AsyncTokenBucket:
+    """Token bucket that lets up to capacity requests through at once, refilled at rate per period.
+    
+    Waiters on the same event loop are served in arrival order. The bucket may
+    be shared by several loops (e.g. the caller's and the tools' background loop):
+    each loop queues its waiters behind its own lock, and the token count itself
+    is guarded by a thread lock.
+    """
+
+    def __init__(self, rate: float, period: float = 60.0, capacity: Optional[float] = None):
+        self.rate = rate / period
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._state_lock = threading.Lock()
+        self._locks: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+
+    def _loop_lock(self) -> asyncio.Lock:
+        """Return the running loop's waiter lock; asyncio locks are bound to one loop."""
+        loop = asyncio.get_running_loop()
+        with self._state_lock:
+            lock = self._locks.get(loop)
+            if lock is None:
+                for stale_loop in [known for known in self._locks if known.is_closed()]:
+                    del self._locks[stale_loop]
+                lock = self._locks[loop] = asyncio.Lock()
+            return lock
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until tokens are available, then take them."""
+        tokens = min(tokens, self.capacity)
+        # Holding the lock while sleeping keeps waiters in FIFO order
+        async with self._loop_lock():
+            while True:
+                with self._state_lock:
+                    now = time.monotonic()
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= tokens:
+                        self._tokens -= tokens
+                        return
+                    wait = (tokens - self._tokens) / self.rate
+                await asyncio.sleep(wait)
+
+    async def __aenter__(self) -> "AsyncTokenBucket":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
@@ -3,6 +3,7 @@ Basic demo that runs without OpenAI API key - shows GitHub agent functionality.
 """
 import asyncio
 from agents.github_agent import GitHubAgent
+from agents.http_client import close_session
 
 
 async def basic_github_demo():
@@ -57,6 +58,9 @@ async def basic_github_demo():
         print(f"Error searching repositories: {e}")
         print("This might be due to GitHub API rate limits or network issues.")
     
+    # Release pooled HTTP connections before the event loop shuts down
+    await close_session()
+    
     print("\nBasic Demo Complete!")
     print("=" * 55)
     print("\nTo run the full demo with reasoning and analysis, you'll need:")
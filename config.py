@@ -20,14 +20,21 @@ class Config:
     MAX_ITERATIONS = int(os.getenv("MAX_ITERATIONS", "5"))
     TEMPERATURE = float(os.getenv("TEMPERATURE", "0.7"))
     MODEL_NAME = os.getenv("MODEL_NAME", "gpt-3.5-turbo")
+    MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", "3"))
+    REQUESTS_PER_MINUTE = float(os.getenv("REQUESTS_PER_MINUTE", "60"))
+    DEBUG = os.getenv("DEBUG", "").lower() in ("1", "true", "yes")
     
     # GitHub API Configuration
     GITHUB_API_BASE = "https://api.github.com"
     
     # Validation
+    _validated = False
+    
     @classmethod
     def validate(cls):
-        """Validate required configuration."""
+        """Validate required configuration (checked once, then remembered)."""
+        if cls._validated:
+            return True
         if not cls.OPENAI_API_KEY:
             raise ValueError(
                 "OPENAI_API_KEY is required. Please:\n"
@@ -35,4 +42,5 @@ class Config:
                 "2. Add: OPENAI_API_KEY=your_actual_api_key_here\n"
                 "3. Make sure the .env file is in the same directory as the script"
             )
+        cls._validated = True
         return True
@@ -3,87 +3,202 @@ CloudBees Agentic Workflow Demo - Correct Issue Counting
 Uses the proper GitHub API approach to get accurate issue counts.
 """
 import asyncio
+import hashlib
 import json
+import re
+from pathlib import Path
+import orjson
 from agents.github_agent import GitHubTool
 from agents.documentation_agent import DocumentationTool
 from agents.reasoning_agent import ReasoningTool
+from agents.http_client import close_session, get_session
 from config import Config
 
+# Raw repository files (README) are served from here, outside the REST API
+_RAW_CONTENT_BASE = "https://raw.githubusercontent.com"
+# Where a README usually lives, most likely first: "{branch}/{file name}"
+_README_CANDIDATES = tuple(
+    f"{branch}/{name}" for branch in ("main", "master") for name in ("README.md", "README.MD", "README.rst")
+)
+
+# GitHub responses persisted across runs, revalidated with If-None-Match
+_cache_dir = Path(".gh_cache")
+
+# Caps on in-flight GitHub requests, to stay clear of the secondary rate
+# limits; the Search API is throttled much harder than plain reads
+_READ_CONCURRENCY = 8
+_SEARCH_CONCURRENCY = 2
+_limits = None
+_limits_loop = None
+
+# README cleanup: strip HTML tags, keep the text of markdown links
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_MARKDOWN_LINK_RE = re.compile(r'\[([^\]]+)\]\([^\)]+\)')
+# Leftovers of badges and notebook links that make a README line useless as a summary
+_HTML_ARTIFACT_RE = re.compile(r'img src=|alt=|colab\.research\.google\.com', re.IGNORECASE)
+
+# README section keywords, matched as substrings of the lowercased heading
+_DESCRIPTION_SECTION_RE = re.compile(r'description|overview|about|what|introduction')
+_INSTALL_SECTION_RE = re.compile(r'install|setup|getting started')
+_USAGE_SECTION_RE = re.compile(r'usage|example|demo|quick start')
+
+# Issue categories in priority order: (name, title keywords, summary line)
+_ISSUE_CATEGORIES = (
+    ('bug', 'bug|error|crash|broken|not working|fails|issue', "**Bug**: {title} - Affects core functionality"),
+    ('security', 'security|vulnerability|exploit|attack', "**Security**: {title} - Potential security vulnerability"),
+    ('performance', 'performance|slow|memory|cpu|optimization', "**Performance**: {title} - Performance optimization needed"),
+    ('documentation', 'documentation|doc|readme|tutorial|guide', "**Documentation**: {title} - Documentation improvement needed"),
+    ('feature', 'feature|enhancement|improvement|request', "**Feature Request**: {title} - New functionality requested"),
+    ('support', 'how to|question|help|support', "**Support**: {title} - User needs assistance"),
+)
+# One pattern for all categories, matched at the start of the lowercased title.
+# Each alternative looks ahead for its keywords anywhere in the title and the
+# alternatives are tried in order, so the first category with a keyword wins;
+# match.lastgroup names it.
+_ISSUE_CATEGORY_RE = re.compile('|'.join(
+    rf'(?=[\s\S]*?(?:{keywords}))(?P<{name}>)' for name, keywords, _ in _ISSUE_CATEGORIES
+))
+_ISSUE_CATEGORY_TEMPLATES = {name: template for name, _, template in _ISSUE_CATEGORIES}
+
+# Issue counts plus the five most recently updated issues, with only the
+# fields the summary uses; GraphQL "issues" excludes pull requests
+_ISSUES_GRAPHQL_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    openIssues: issues(states: OPEN) { totalCount }
+    closedIssues: issues(states: CLOSED) { totalCount }
+    recent: issues(first: 5, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      nodes { title state createdAt labels(first: 100) { nodes { name } } }
+    }
+  }
+}
+"""
+
+def _request_limits():
+    """Return the (read, search) semaphores for the running loop, creating them on first use."""
+    global _limits, _limits_loop
+
+    loop = asyncio.get_running_loop()
+    # Like the shared session, semaphores are bound to the loop that waits on them
+    if _limits is None or _limits_loop is not loop:
+        _limits = (asyncio.Semaphore(_READ_CONCURRENCY), asyncio.Semaphore(_SEARCH_CONCURRENCY))
+        _limits_loop = loop
+    return _limits
+
+
+async def _fetch_raw_file(session, url: str):
+    """Download a raw repository file, or return None if it is missing or unreachable."""
+    try:
+        async with _request_limits()[0], session.get(url) as response:
+            if response.status != 200:
+                return None
+            return await response.text()
+    except Exception:
+        return None
+
+async def _fetch_readme(repo_name: str) -> str:
+    """Download the raw README, trying every branch/file name candidate at once.
+
+    The candidate earliest in _README_CANDIDATES that exists wins, and the
+    remaining downloads are cancelled as soon as it arrives.
+    """
+    session = await get_session()
+    downloads = [
+        asyncio.create_task(_fetch_raw_file(session, f"{_RAW_CONTENT_BASE}/{repo_name}/{path}"))
+        for path in _README_CANDIDATES
+    ]
+    try:
+        for download in downloads:
+            readme = await download
+            if readme is not None:
+                return readme
+    finally:
+        for download in downloads:
+            download.cancel()
+    raise Exception("README not found")
+
 async def get_correct_repo_analysis(repo_name: str):
     """Get correct repository analysis with accurate issue counts."""
     
-    github_tool = GitHubTool()
+    github_tool = GitHubTool(Config.GITHUB_TOKEN)
     
-    # Get repository basic info
-    repo_info = await github_tool.get_repository_info(repo_name)
+    # Repository info, accurate issue counts (separate API calls) and the
+    # README are independent, so all three are fetched concurrently
+    repo_info, issues_info, readme_result = await asyncio.gather(
+        github_tool.agent.get_repository_info(repo_name),
+        get_accurate_issue_counts(repo_name, github_tool),
+        _fetch_readme(repo_name),
+        return_exceptions=True
+    )
+    if isinstance(repo_info, Exception):
+        raise repo_info
+    if isinstance(issues_info, Exception):
+        raise issues_info
     
-    # Get accurate issue counts using separate API calls
-    issues_info = await get_accurate_issue_counts(repo_name, github_tool)
-    
-    # Try to get README content with meaningful extraction
+    # Extract meaningful README content once the network I/O is done.
+    # readme_lines keeps the extracted text without its "**Label**: " prefix
+    # for the Key Information section.
     readme_content = None
+    readme_lines = []
     try:
-        doc_tool = DocumentationTool()
-        readme_url = f"https://raw.githubusercontent.com/{repo_name}/main/README.md"
-        readme_result = await doc_tool._arun(f"Fetch and analyze content from {readme_url}")
+        if isinstance(readme_result, Exception):
+            raise readme_result
         
-        # Extract meaningful content instead of raw analysis
-        if hasattr(doc_tool, 'agent') and doc_tool.agent:
-            # For README.md files, extract meaningful content
-            lines = readme_result.split('\n')
-            meaningful_content = []
-            
-            # Look for key sections that developers care about
-            current_section = None
-            for line in lines[:50]:  # First 50 lines
+        # For README.md files, extract meaningful content. Only the first 50
+        # lines are examined, so stop splitting once they are found.
+        lines = readme_result.split('\n', 50)[:50]
+        meaningful_content = []
+        
+        # Look for key sections that developers care about
+        current_section = None
+        for line in lines:
+            line = line.strip()
+            if line.startswith('#'):
+                current_section = line.lower()
+            elif line and len(line) > 30:
+                # Clean up HTML and markdown syntax
+                clean_line = line
+                # Remove HTML tags
+                clean_line = _HTML_TAG_RE.sub('', clean_line)
+                # Remove markdown links but keep text
+                clean_line = _MARKDOWN_LINK_RE.sub(r'\1', clean_line)
+                # Remove extra whitespace
+                clean_line = ' '.join(clean_line.split())
+                
+                if clean_line and len(clean_line) > 20:
+                    # Extract content from important sections
+                    if _DESCRIPTION_SECTION_RE.search(current_section):
+                        meaningful_content.append(("Description", clean_line))
+                    elif _INSTALL_SECTION_RE.search(current_section):
+                        meaningful_content.append(("Installation", clean_line))
+                    elif _USAGE_SECTION_RE.search(current_section):
+                        meaningful_content.append(("Usage", clean_line))
+                    elif len(meaningful_content) < 3:  # Get first 3 meaningful pieces
+                        meaningful_content.append(("Content", clean_line))
+        
+        if meaningful_content:
+            readme_content = '\n\n'.join(f"**{label}**: {text}" for label, text in meaningful_content)
+            readme_lines = [text for _, text in meaningful_content]
+        else:
+            # Fallback: get first meaningful paragraph
+            for line in lines[:20]:
                 line = line.strip()
-                if line.startswith('#'):
-                    current_section = line.lower()
-                elif line and len(line) > 30:
-                    # Clean up HTML and markdown syntax
-                    clean_line = line
-                    # Remove HTML tags
-                    import re
-                    clean_line = re.sub(r'<[^>]+>', '', clean_line)
-                    # Remove markdown links but keep text
-                    clean_line = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', clean_line)
-                    # Remove extra whitespace
+                if line and len(line) > 50 and not line.startswith('#'):
+                    # Clean up the line
+                    clean_line = _HTML_TAG_RE.sub('', line)
+                    clean_line = _MARKDOWN_LINK_RE.sub(r'\1', clean_line)
                     clean_line = ' '.join(clean_line.split())
-                    
-                    if clean_line and len(clean_line) > 20:
-                        # Extract content from important sections
-                        if any(keyword in current_section for keyword in ['description', 'overview', 'about', 'what', 'introduction']):
-                            meaningful_content.append(f"**Description**: {clean_line}")
-                        elif any(keyword in current_section for keyword in ['install', 'setup', 'getting started']):
-                            meaningful_content.append(f"**Installation**: {clean_line}")
-                        elif any(keyword in current_section for keyword in ['usage', 'example', 'demo', 'quick start']):
-                            meaningful_content.append(f"**Usage**: {clean_line}")
-                        elif len(meaningful_content) < 3:  # Get first 3 meaningful pieces
-                            meaningful_content.append(f"**Content**: {clean_line}")
-            
-            if meaningful_content:
-                readme_content = '\n\n'.join(meaningful_content)
+                    if clean_line:
+                        readme_content = clean_line
+                        break
             else:
-                # Fallback: get first meaningful paragraph
-                for line in lines[:20]:
-                    line = line.strip()
-                    if line and len(line) > 50 and not line.startswith('#'):
-                        # Clean up the line
-                        clean_line = re.sub(r'<[^>]+>', '', line)
-                        clean_line = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', clean_line)
-                        clean_line = ' '.join(clean_line.split())
-                        if clean_line:
-                            readme_content = clean_line
-                            break
-                else:
-                    readme_content = "README content extracted but no meaningful content found"
-        else:
-            readme_content = readme_result
+                readme_content = "README content extracted but no meaningful content found"
+            readme_lines = [readme_content]
     except Exception as e:
         readme_content = "README not available"
     
     # Create accurate summary
-    summary = f"""
+    parts = [f"""
 ## Repository Analysis: {repo_info.full_name}
 
 ### Basic Information
@@ -100,145 +215,230 @@ async def get_correct_repo_analysis(repo_name: str):
 - **Recent Issues Sample**: {len(issues_info['recent_issues'])} issues shown below
 
 ### Recent Issues
-"""
+"""]
     
-    for issue in issues_info['recent_issues']:
-        summary += f"- **{issue['title']}** ({issue['state']}) - {issue['created_at']}\n"
-        if issue['labels']:
-            summary += f"  Labels: {', '.join(issue['labels'])}\n"
+    parts.append(''.join(
+        f"- **{issue['title']}** ({issue['state']}) - {issue['created_at']}\n"
+        + (f"  Labels: {', '.join(issue['labels'])}\n" if issue['labels'] else "")
+        for issue in issues_info['recent_issues']
+    ))
     
     # Add Major/Critical Issues section only if there are issues
     if issues_info['open_issues'] > 0:
-        summary += f"\n### Major/Critical Issues\n"
+        parts.append(f"\n### Major/Critical Issues\n")
         
-        # Analyze recent issues to identify important ones
-        important_issues = []
-        for issue in issues_info['recent_issues']:
-            title_lower = issue['title'].lower()
-            # Identify important issues based on keywords and patterns
-            if any(keyword in title_lower for keyword in ['bug', 'error', 'crash', 'broken', 'not working', 'fails', 'issue']):
-                important_issues.append(f"**Bug**: {issue['title']} - Affects core functionality")
-            elif any(keyword in title_lower for keyword in ['security', 'vulnerability', 'exploit', 'attack']):
-                important_issues.append(f"**Security**: {issue['title']} - Potential security vulnerability")
-            elif any(keyword in title_lower for keyword in ['performance', 'slow', 'memory', 'cpu', 'optimization']):
-                important_issues.append(f"**Performance**: {issue['title']} - Performance optimization needed")
-            elif any(keyword in title_lower for keyword in ['documentation', 'doc', 'readme', 'tutorial', 'guide']):
-                important_issues.append(f"**Documentation**: {issue['title']} - Documentation improvement needed")
-            elif any(keyword in title_lower for keyword in ['feature', 'enhancement', 'improvement', 'request']):
-                important_issues.append(f"**Feature Request**: {issue['title']} - New functionality requested")
-            elif any(keyword in title_lower for keyword in ['how to', 'question', 'help', 'support']):
-                important_issues.append(f"**Support**: {issue['title']} - User needs assistance")
+        # Analyze recent issues to identify important ones, based on keywords and patterns
+        categories = ((issue, _ISSUE_CATEGORY_RE.match(issue['title'].lower())) for issue in issues_info['recent_issues'])
+        important_issues = [
+            _ISSUE_CATEGORY_TEMPLATES[category.lastgroup].format(title=issue['title'])
+            for issue, category in categories if category
+        ]
         
         if important_issues:
-            for issue in important_issues[:5]:  # Show top 5 important issues
-                summary += f"- {issue}\n"
+            # Show top 5 important issues
+            parts.append(''.join(f"- {issue}\n" for issue in important_issues[:5]))
         else:
-            # If no specific important issues found, show the most recent issues as important
-            summary += f"- **Recent Important Issues**:\n"
-            for issue in issues_info['recent_issues'][:3]:  # Show top 3 recent issues
-                summary += f"  - {issue['title']}\n"
-            summary += f"- **Overall**: {issues_info['open_issues']} open issues may indicate maintenance challenges\n"
+            # If no specific important issues found, show the 3 most recent issues as important
+            parts.append(f"- **Recent Important Issues**:\n")
+            parts.append(''.join(f"  - {issue['title']}\n" for issue in issues_info['recent_issues'][:3]))
+            parts.append(f"- **Overall**: {issues_info['open_issues']} open issues may indicate maintenance challenges\n")
     
     if repo_info.topics:
-        summary += f"\n### Topics\n{', '.join(repo_info.topics)}\n"
+        parts.append(f"\n### Topics\n{', '.join(repo_info.topics)}\n")
     
     # Add README content if available (simplified)
-    if readme_content and readme_content != "README not available":
-        # Clean up the content for better readability
-        clean_content = readme_content.replace("**Content**: ", "").replace("**Description**: ", "").replace("**Installation**: ", "").replace("**Usage**: ", "")
-        # Remove duplicate lines and clean up
-        lines = clean_content.split('\n')
-        unique_lines = []
-        for line in lines:
+    if readme_lines:
+        # Remove duplicate lines and clean up in a single pass; the section is
+        # shown whenever there is a candidate line, even if none qualifies
+        has_candidates = False
+        key_lines = []
+        seen = set()
+        for line in readme_lines:
             line = line.strip()
-            if line and line not in unique_lines and len(line) > 20:
-                unique_lines.append(line)
+            if not line or line in seen or len(line) <= 20:
+                continue
+            seen.add(line)
+            has_candidates = True
+            
+            # Clean up the line to remove HTML and make it readable
+            clean_line = _HTML_TAG_RE.sub('', line)
+            clean_line = _MARKDOWN_LINK_RE.sub(r'\1', clean_line)
+            clean_line = ' '.join(clean_line.split())
+            
+            # Only include lines that are meaningful and not HTML artifacts
+            if (clean_line and len(clean_line) > 30 and 
+                not clean_line.startswith('**') and 
+                not _HTML_ARTIFACT_RE.search(line)):
+                key_lines.append(f"- {clean_line}\n")
+                if len(key_lines) >= 3:  # Limit to 3 meaningful lines
+                    break
         
-        if unique_lines:
-            summary += f"\n### Key Information\n"
-            meaningful_count = 0
-            for line in unique_lines:
-                # Clean up the line to remove HTML and make it readable
-                clean_line = re.sub(r'<[^>]+>', '', line)
-                clean_line = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', clean_line)
-                clean_line = ' '.join(clean_line.split())
-                
-                # Only include lines that are meaningful and not HTML artifacts
-                if (clean_line and len(clean_line) > 30 and 
-                    not clean_line.startswith('**') and 
-                    not any(tag in line.lower() for tag in ['img src=', 'alt=', 'colab.research.google.com'])):
-                    summary += f"- {clean_line}\n"
-                    meaningful_count += 1
-                    if meaningful_count >= 3:  # Limit to 3 meaningful lines
-                        break
+        if has_candidates:
+            parts.append(f"\n### Key Information\n")
+            parts.extend(key_lines)
     
-    return summary, readme_content
+    return ''.join(parts), readme_content
+
+def _read_cache_file(cache_file: Path):
+    """Return the stored {etag, body} entry, or None if it is missing or unreadable."""
+    if not cache_file.exists():
+        return None
+    try:
+        return json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        return None
+
+def _write_cache_file(cache_file: Path, etag: str, body) -> None:
+    """Store a response body with its ETag for revalidation on a later run."""
+    try:
+        _cache_dir.mkdir(exist_ok=True)
+        cache_file.write_text(json.dumps({"etag": etag, "body": body}))
+    except OSError:
+        pass  # The cache is an optimization; a read-only disk just means no reuse
+
+async def cached_get(session, url: str, params: dict, headers: dict, limit: asyncio.Semaphore = None):
+    """GET a GitHub API URL as JSON, revalidating the on-disk copy with its ETag.
+
+    Returns the decoded body, or None for a non-200 response. A 304 reply
+    serves the stored body and does not count against the rate limit. At
+    most limit's worth of requests are in flight at once (the read limit by
+    default).
+    """
+    key = hashlib.sha1(f"{url}?{sorted(params.items())}".encode()).hexdigest()
+    cache_file = _cache_dir / f"{key}.json"
+
+    # Disk access runs off the loop, since cached_get is gathered with other requests
+    cached = await asyncio.to_thread(_read_cache_file, cache_file)
+    if cached:
+        headers = {**headers, "If-None-Match": cached["etag"]}
+
+    if limit is None:
+        limit = _request_limits()[0]
+    async with limit, session.get(url, params=params, headers=headers) as response:
+        if response.status == 304 and cached:
+            return cached["body"]
+        if response.status != 200:
+            return None
+        body = await response.json()
+        etag = response.headers.get("ETag")
+
+    if etag:
+        await asyncio.to_thread(_write_cache_file, cache_file, etag, body)
+    return body
+
+async def get_issue_counts_graphql(session, repo_name: str, github_tool):
+    """Get issue counts and recent issues in one GraphQL round trip.
+
+    Only the fields the summary uses are requested. Returns None when the
+    query is not answered, so the caller can fall back to the REST calls.
+    """
+    owner, _, name = repo_name.partition('/')
+    payload = {"query": _ISSUES_GRAPHQL_QUERY, "variables": {"owner": owner, "name": name}}
+
+    async with _request_limits()[0], session.post(f"{github_tool.agent.base_url}/graphql", json=payload,
+                                                  headers=github_tool.agent.headers) as response:
+        if response.status != 200:
+            return None
+        result = await response.json()
+
+    repository = (result.get('data') or {}).get('repository')
+    if result.get('errors') or not repository:
+        return None
+
+    open_issues = repository['openIssues']['totalCount']
+    closed_issues = repository['closedIssues']['totalCount']
+    recent_issues = [
+        {
+            "title": issue["title"],
+            "state": issue["state"].lower(),
+            "created_at": issue["createdAt"],
+            "labels": [label["name"] for label in issue["labels"]["nodes"]]
+        }
+        for issue in repository['recent']['nodes']
+    ]
+
+    return {
+        'total_issues': open_issues + closed_issues,
+        'open_issues': open_issues,
+        'closed_issues': closed_issues,
+        'recent_issues': recent_issues
+    }
 
 async def get_accurate_issue_counts(repo_name: str, github_tool):
     """Get accurate issue counts using proper GitHub API calls."""
     
-    import aiohttp
-    
+    # The shared pooled session keeps GitHub connections alive across calls
+    session = await get_session()
+    headers = github_tool.agent.headers
+
+    # GraphQL answers everything in one request but needs a token
+    if "Authorization" in headers:
+        try:
+            issues_info = await get_issue_counts_graphql(session, repo_name, github_tool)
+        except Exception:
+            issues_info = None
+        if issues_info is not None:
+            return issues_info
+
     # Use the search API to get accurate counts
     # This is more reliable than the issues endpoint for counts
     
-    async with aiohttp.ClientSession(headers=github_tool.headers) as session:
-        # Get open issues count
-        open_url = f"{github_tool.base_url}/search/issues"
-        open_params = {
-            "q": f"repo:{repo_name} type:issue state:open",
-            "per_page": 1  # We only need the count
-        }
-        
-        async with session.get(open_url, params=open_params) as response:
-            if response.status == 200:
-                open_data = await response.json()
-                open_issues = open_data.get('total_count', 0)
-            else:
-                open_issues = 0
-        
-        # Get closed issues count
-        closed_params = {
-            "q": f"repo:{repo_name} type:issue state:closed",
+    search_url = f"{github_tool.agent.base_url}/search/issues"
+
+    async def _fetch_count(state: str):
+        """Get the issue count for one state from the search API."""
+        params = {
+            "q": f"repo:{repo_name} type:issue state:{state}",
             "per_page": 1  # We only need the count
         }
-        
-        async with session.get(open_url, params=closed_params) as response:
-            if response.status == 200:
-                closed_data = await response.json()
-                closed_issues = closed_data.get('total_count', 0)
-            else:
-                closed_issues = 0
-        
-        # Get recent issues for display
-        recent_url = f"{github_tool.base_url}/repos/{repo_name}/issues"
+
+        data = await cached_get(session, search_url, params, headers, _request_limits()[1])
+        if data is not None:
+            return data.get('total_count', 0)
+        return 0
+
+    async def _fetch_recent():
+        """Get recent issues for display."""
+        recent_url = f"{github_tool.agent.base_url}/repos/{repo_name}/issues"
         recent_params = {"state": "all", "per_page": 10, "sort": "updated"}
-        
-        async with session.get(recent_url, params=recent_params) as response:
-            if response.status == 200:
-                all_items = await response.json()
-                # Filter out pull requests
-                issues_only = [item for item in all_items if 'pull_request' not in item]
-                
-                recent_issues = []
-                for issue in issues_only[:5]:
-                    recent_issues.append({
-                        "title": issue["title"],
-                        "state": issue["state"],
-                        "created_at": issue["created_at"],
-                        "labels": [label["name"] for label in issue.get("labels", [])]
-                    })
-            else:
-                recent_issues = []
-        
-        total_issues = open_issues + closed_issues
-        
-        return {
-            'total_issues': total_issues,
-            'open_issues': open_issues,
-            'closed_issues': closed_issues,
-            'recent_issues': recent_issues
-        }
+
+        all_items = await cached_get(session, recent_url, recent_params, headers)
+        if all_items is None:
+            return []
+        # Filter out pull requests
+        issues_only = [item for item in all_items if 'pull_request' not in item]
+
+        recent_issues = []
+        for issue in issues_only[:5]:
+            recent_issues.append({
+                "title": issue["title"],
+                "state": issue["state"],
+                "created_at": issue["created_at"],
+                "labels": [label["name"] for label in issue.get("labels", [])]
+            })
+        return recent_issues
+
+    # The three requests are independent, so they share one round-trip slot
+    open_issues, closed_issues, recent_issues = await asyncio.gather(
+        _fetch_count("open"), _fetch_count("closed"), _fetch_recent(),
+        return_exceptions=True
+    )
+    # A failed request degrades to an empty result, like a non-200 response
+    if isinstance(open_issues, Exception):
+        open_issues = 0
+    if isinstance(closed_issues, Exception):
+        closed_issues = 0
+    if isinstance(recent_issues, Exception):
+        recent_issues = []
+
+    total_issues = open_issues + closed_issues
+    
+    return {
+        'total_issues': total_issues,
+        'open_issues': open_issues,
+        'closed_issues': closed_issues,
+        'recent_issues': recent_issues
+    }
 
 async def get_clean_reasoning_analysis(repo_name: str, github_data: str, readme_data: str, additional_docs: str = None):
     """Get clean reasoning analysis with proper formatting."""
@@ -255,7 +455,7 @@ async def get_clean_reasoning_analysis(repo_name: str, github_data: str, readme_
     }
     
     try:
-        reasoning_query = f"analyze:{json.dumps(reasoning_data)}"
+        reasoning_query = f"analyze:{orjson.dumps(reasoning_data).decode()}"
         reasoning_result = await reasoning_tool._arun(reasoning_query)
         
         # Debug: Print what we actually got (remove for production)
@@ -340,18 +540,8 @@ async def analyze_repository_correct(repository_name: str, additional_doc_url: s
     # Step 1: Correct GitHub + README Analysis
     print("Step 1: Correct GitHub Repository + README Analysis")
     print("-" * 50)
-    
-    try:
-        github_result, readme_content = await get_correct_repo_analysis(repository_name)
-        results['github_and_readme'] = github_result
-        results['readme_content'] = readme_content
-        print("Correct GitHub + README analysis completed")
-        
-    except Exception as e:
-        print(f"GitHub analysis failed: {e}")
-        results['github_and_readme'] = f"Error: {e}"
-        results['readme_content'] = "Error"
-    
+    tasks = [get_correct_repo_analysis(repository_name)]
+
     # Step 2: Additional Documentation (if provided)
     additional_docs = None
     step_counter = 2
@@ -359,18 +549,30 @@ async def analyze_repository_correct(repository_name: str, additional_doc_url: s
         print(f"\nStep 2: Additional Documentation Analysis")
         print("-" * 40)
         print(f"Analyzing: {additional_doc_url}")
-        
-        try:
-            doc_result = await doc_tool._arun(f"Analyze documentation at {additional_doc_url}")
-            additional_docs = doc_result
-            results['additional_docs'] = doc_result
-            print("Additional documentation analysis completed")
-            
-        except Exception as e:
-            print(f"Additional documentation analysis failed: {e}")
-            results['additional_docs'] = f"Error: {e}"
-        
+        tasks.append(doc_tool._arun(f"Analyze documentation at {additional_doc_url}"))
         step_counter = 3
+
+    # Steps 1 and 2 share no data, so they run concurrently
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+    if isinstance(outcomes[0], Exception):
+        print(f"GitHub analysis failed: {outcomes[0]}")
+        results['github_and_readme'] = f"Error: {outcomes[0]}"
+        results['readme_content'] = "Error"
+    else:
+        github_result, readme_content = outcomes[0]
+        results['github_and_readme'] = github_result
+        results['readme_content'] = readme_content
+        print("Correct GitHub + README analysis completed")
+
+    if additional_doc_url:
+        if isinstance(outcomes[1], Exception):
+            print(f"Additional documentation analysis failed: {outcomes[1]}")
+            results['additional_docs'] = f"Error: {outcomes[1]}"
+        else:
+            additional_docs = outcomes[1]
+            results['additional_docs'] = additional_docs
+            print("Additional documentation analysis completed")
     
     # Final Step: Clean Reasoning Analysis
     print(f"\nStep {step_counter}: AI Reasoning Analysis")
@@ -465,6 +667,15 @@ async def main():
         
     except Exception as e:
         print(f"Analysis failed: {e}")
+    
+    # Release pooled HTTP connections before the event loop shuts down
+    await close_session()
 
 if __name__ == "__main__":
+    # uvloop runs the event loop in C; it is optional, so fall back to asyncio's default
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
@@ -3,47 +3,87 @@ Main orchestration workflow for the agentic system.
 Demonstrates autonomous multi-agent collaboration for repository analysis.
 """
 import asyncio
-import json
+import atexit
+import contextlib
+import copy
+import functools
+import hashlib
+import logging
+import queue
+import re
 import sys
-from typing import Dict, List, Optional, Any
+from logging.handlers import QueueHandler, QueueListener
+from typing import AsyncIterator, Dict, Final, List, Optional, Any, Tuple
+import orjson
 from langchain.agents import AgentExecutor, create_openai_tools_agent
 from langchain.tools import Tool
 from langchain.prompts import ChatPromptTemplate
-from langchain.chat_models import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
-from langchain.prompts import MessagesPlaceholder
+from langchain.prompts import HumanMessagePromptTemplate, MessagesPlaceholder
 
 # Import our custom agents
 from agents.github_agent import GitHubTool
 from agents.documentation_agent import DocumentationTool
-from agents.reasoning_agent import ReasoningTool
+from agents.reasoning_agent import ReasoningTool, get_llm, _TIME_SENSITIVE_RE
+from agents.cache import TTLCache
+from agents.http_client import close_session, set_llm_rate_limit
 from config import Config
 
 
-class AgenticWorkflowOrchestrator:
-    """Main orchestrator for the agentic workflow."""
+logger = logging.getLogger(__name__)
+_log_listener: Optional[QueueListener] = None
+
+
+class _StreamAwareHandler(logging.StreamHandler):
+    """StreamHandler that lets a record pick its own line ending via extra={"end": ...}."""
     
-    def __init__(self):
-        # Validate configuration
-        Config.validate()
-        
-        # Initialize LLM
-        self.llm = ChatOpenAI(
-            openai_api_key=Config.OPENAI_API_KEY,
-            model_name=Config.MODEL_NAME,
-            temperature=Config.TEMPERATURE
-        )
-        
-        # Initialize tools
-        self.tools = [
-            GitHubTool(Config.GITHUB_TOKEN),
-            DocumentationTool(),
-            ReasoningTool(Config.OPENAI_API_KEY, Config.MODEL_NAME, Config.TEMPERATURE)
-        ]
-        
-        # Create agent prompt
-        self.prompt = ChatPromptTemplate.from_messages([
-            SystemMessage(content="""You are an intelligent agentic workflow orchestrator. Your role is to:
+    def emit(self, record: logging.LogRecord) -> None:
+        # The listener thread is the only caller, so swapping the terminator is safe
+        self.terminator = getattr(record, "end", "\n")
+        super().emit(record)
+
+
+def _start_log_listener() -> None:
+    """Hand this module's log records to a background thread for writing to stdout.
+    
+    Workflow coroutines only enqueue records, so a slow terminal or pipe never
+    blocks the event loop.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = _StreamAwareHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _log_listener = QueueListener(log_queue, handler)
+    _log_listener.start()
+    # Flushes any queued records on interpreter shutdown
+    atexit.register(_log_listener.stop)
+    
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def _echo(text: str, end: str = "\n") -> None:
+    """Write answer text through the log queue, so it cannot interleave with log lines."""
+    logger.info(text, extra={"end": end})
+
+
+# "owner/repo" references in free-form search output: either after github.com/,
+# or standing alone, i.e. not part of a longer path or host, and not a file path
+# like docs/index.html. Owners cannot contain dots, repositories can.
+_REPO_RE = re.compile(
+    r'github\.com/([A-Za-z0-9-]+)/([A-Za-z0-9_.-]*[A-Za-z0-9_-])'
+    r'|(?<![\w./-])([A-Za-z0-9-]+)/'
+    r'(?![\w.-]*\.(?:html?|md|rst|txt|py|json|ya?ml|toml)(?![\w-]|\.\w))'
+    r'([A-Za-z0-9_.-]*[A-Za-z0-9_-])(?![\w/-]|\.\w)'
+)
+
+
+# Orchestrator agent instructions
+_SYSTEM_PROMPT: Final[str] = """You are an intelligent agentic workflow orchestrator. Your role is to:
 
 1. **Analyze GitHub Repositories**: Use the github_analyzer tool to fetch repository information, issues, and search for repositories.
 
@@ -67,103 +107,445 @@ class AgenticWorkflowOrchestrator:
 - documentation_analyzer: Fetch and analyze documentation from URLs
 - reasoning_analyzer: Validate data and apply logical reasoning
 
-Use these tools autonomously to complete the user's request."""),
-            HumanMessage(content="{input}"),
-            MessagesPlaceholder(variable_name="agent_scratchpad")
-        ])
-        
-        # Create agent
-        self.agent = create_openai_tools_agent(self.llm, self.tools, self.prompt)
-        self.agent_executor = AgentExecutor(
-            agent=self.agent,
-            tools=self.tools,
-            verbose=True,
-            max_iterations=Config.MAX_ITERATIONS,
-            handle_parsing_errors=True
+Use these tools autonomously to complete the user's request."""
+
+# Built once and shared by every agent executor
+_AGENT_PROMPT = ChatPromptTemplate.from_messages([
+    SystemMessage(content=_SYSTEM_PROMPT),
+    HumanMessagePromptTemplate.from_template("{input}"),
+    MessagesPlaceholder(variable_name="agent_scratchpad")
+])
+
+# Final recommendations step; the instructions stay a fixed system prefix and only
+# the human message varies, so providers with prompt caching can reuse the prefix
+_FINAL_PROMPT = ChatPromptTemplate.from_messages([
+    SystemMessage(content="""Based on the GitHub analysis and documentation analysis, provide:
+1. A comprehensive summary of the repository
+2. Key strengths and weaknesses
+3. Actionable recommendations for improvement
+4. Next steps for someone interested in this project"""),
+    HumanMessagePromptTemplate.from_template("""Known Facts:
+{facts}{analyses}{validation}""")
+])
+
+# Facts lifted out of agent output into a workflow's memory slots
+_MEMORY_SLOT_RES = {
+    "language": re.compile(r'Primary Language\W*([^\n*]+)', re.IGNORECASE),
+    "stars": re.compile(r'Stars\W*(\d[\d,.]*\s*[kKmM]?)'),
+    "forks": re.compile(r'Forks\W*(\d[\d,.]*\s*[kKmM]?)'),
+    "open_issues": re.compile(r'Open Issues\W*(\d[\d,]*)', re.IGNORECASE),
+    "doc_summary": re.compile(r'(?:Summary|Overview|Description)\W*([^\n]+)', re.IGNORECASE),
+    "confidence": re.compile(r'Confidence\W*(\d(?:\.\d+)?)', re.IGNORECASE),
+}
+
+# The slots each earlier step's output fills; the output itself is only carried
+# into later prompts when one of its slots stays empty
+_GITHUB_SLOTS = ("language", "stars", "forks", "open_issues")
+_DOCUMENTATION_SLOTS = ("doc_summary",)
+
+
+def _fill_memory(memory: Dict[str, Any], result: Optional[Dict[str, Any]], slots: Tuple[str, ...]) -> None:
+    """Fill empty memory slots with the facts found in an agent run's output."""
+    if result is None:
+        return
+    output = str(result.get("output", ""))
+    for slot in slots:
+        if memory.get(slot) is None:
+            match = _MEMORY_SLOT_RES[slot].search(output)
+            if match:
+                memory[slot] = match.group(1).strip()
+
+
+# Validation verdicts that mean a speculative final step cannot be kept: an explicit
+# "Valid: No", a low confidence, or problem wording that is not negated
+# ("no inconsistencies found" is a clean bill; group 1 holds the negation)
+_INVALID_VERDICT_RE = re.compile(r'\bValid\W*No\b', re.IGNORECASE)
+_LOW_CONFIDENCE = 0.5
+_VALIDATION_FLAG_RE = re.compile(
+    r'(?:\b(no|not|nothing|none|without|zero)\W+(?:\w+\W+){0,2})?'
+    r'\b(?:inconsisten|contradict|mismatch|unreliable|questionable)',
+    re.IGNORECASE
+)
+
+
+def _validation_flagged(output: str, confidence: Optional[str]) -> bool:
+    """Whether a validation run's verdict reports a problem, rather than merely naming one."""
+    if _INVALID_VERDICT_RE.search(output):
+        return True
+    if confidence is not None and float(confidence) < _LOW_CONFIDENCE:
+        return True
+    return any(match.group(1) is None for match in _VALIDATION_FLAG_RE.finditer(output))
+
+
+def _slots_filled(memory: Dict[str, Any], slots: Tuple[str, ...]) -> bool:
+    """Whether every one of the given memory slots holds a value."""
+    return all(memory.get(slot) is not None for slot in slots)
+
+
+def _render_memory(memory: Dict[str, Any]) -> str:
+    """Render the filled memory slots as a compact fact list for prompts."""
+    return "\n".join(f"- {slot}: {value}" for slot, value in memory.items() if value is not None)
+
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace so equivalent workflow inputs share a plan cache key."""
+    return " ".join(text.split())
+
+
+async def _collect(events: AsyncIterator[Dict[str, Any]]) -> Dict[str, Any]:
+    """Fold a workflow's step events back into a single result dict."""
+    result = {}
+    async for event in events:
+        result[event["step"]] = event["result"]
+    return result
+
+
+async def _none() -> None:
+    """Placeholder awaitable for optional workflow steps that are skipped."""
+    return None
+
+
+def _digest(result: Optional[Dict[str, Any]], max_chars: int = 1500) -> Optional[str]:
+    """Shorten an agent run to its (truncated) output for embedding in later prompts."""
+    if result is None:
+        return None
+    output = str(result.get("output", ""))
+    return output if len(output) <= max_chars else output[:max_chars] + "..."
+
+
+@functools.lru_cache(maxsize=None)
+def _build_agent_executor(openai_api_key: str, model_name: str, temperature: float,
+                          github_token: str, max_iterations: int, verbose: bool) -> AgentExecutor:
+    """Return the agent executor shared by every orchestrator with these settings.
+    
+    Building the model, tools and agent is the bulk of orchestrator
+    start-up, so it is done once per configuration.
+    """
+    # Initialize LLM
+    llm = get_llm(openai_api_key, model_name, temperature)
+    
+    # Initialize tools
+    tools = [
+        GitHubTool(github_token),
+        DocumentationTool(),
+        ReasoningTool(openai_api_key, model_name, temperature)
+    ]
+    
+    # Create agent
+    agent = create_openai_tools_agent(llm, tools, _AGENT_PROMPT)
+    return AgentExecutor(
+        agent=agent,
+        tools=tools,
+        # Step-by-step tracing is formatted and flushed to stdout on every step, so it is debug-only
+        verbose=verbose,
+        max_iterations=max_iterations,
+        handle_parsing_errors=True
+    )
+
+
+class AgenticWorkflowOrchestrator:
+    """Main orchestrator for the agentic workflow."""
+    
+    def __init__(self, cache_responses: Optional[bool] = None):
+        # Validate configuration
+        Config.validate()
+        _start_log_listener()
+        # Every chat completion, including those made inside tools, is charged
+        # to one process-wide bucket at the OpenAI transport
+        set_llm_rate_limit(Config.REQUESTS_PER_MINUTE)
+        
+        # Model, tools, prompt and agent are shared with other orchestrators
+        self.llm = get_llm(Config.OPENAI_API_KEY, Config.MODEL_NAME, Config.TEMPERATURE)
+        self.agent_executor = _build_agent_executor(
+            Config.OPENAI_API_KEY,
+            Config.MODEL_NAME,
+            Config.TEMPERATURE,
+            Config.GITHUB_TOKEN,
+            Config.MAX_ITERATIONS,
+            Config.DEBUG
         )
+        self.tools = self.agent_executor.tools
+        self.github_tool = next(tool for tool in self.tools if isinstance(tool, GitHubTool))
+        self.agent = self.agent_executor.agent
+        self.prompt = _AGENT_PROMPT
+        
+        # Caps how many agent runs a workflow fans out at once
+        self._semaphore = asyncio.Semaphore(Config.MAX_CONCURRENCY)
+        
+        # Only deterministic (temperature 0) runs are reused unless the caller opts in,
+        # the same rule as ReasoningAgent's response cache
+        self.cache_responses = Config.TEMPERATURE == 0 if cache_responses is None else cache_responses
+        
+        # Agent run results, keyed by a digest of the model settings and input
+        self._cache = TTLCache(maxsize=256, ttl=3600)
+        
+        # Whole workflow results, keyed by workflow name and normalized inputs
+        self._plan_cache = TTLCache(maxsize=64, ttl=3600)
+    
+    async def __aenter__(self) -> "AgenticWorkflowOrchestrator":
+        return self
+    
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Release the pooled HTTP connections shared by the tools and the OpenAI client on this loop."""
+        await close_session()
+    
+    def _plan_key(self, *inputs: Any) -> Optional[Tuple[Any, ...]]:
+        """Plan cache key for a workflow run, or None when its result must not be reused.
+        
+        Like agent runs, only deterministic workflows are cached, and never ones
+        whose text inputs are framed around "now".
+        """
+        if not self.cache_responses:
+            return None
+        if any(isinstance(value, str) and _TIME_SENSITIVE_RE.search(value) for value in inputs):
+            return None
+        return inputs
     
-    async def analyze_repository_workflow(self, repository_name: str, documentation_url: Optional[str] = None) -> Dict[str, Any]:
-        """Complete workflow for analyzing a repository and its documentation."""
+    def _get_plan(self, key: Optional[Tuple[Any, ...]]) -> Optional[Dict[str, Any]]:
+        """Return a copy of a recent identical workflow run's result, or None."""
+        cached = self._plan_cache.get(key) if key is not None else None
+        if cached is None:
+            return None
+        logger.info("Reusing the result of an identical recent workflow run")
+        return copy.deepcopy(cached)
+    
+    def _put_plan(self, key: Optional[Tuple[Any, ...]], result: Dict[str, Any]) -> None:
+        """Cache a copy of a completed workflow's result."""
+        if key is not None:
+            self._plan_cache.put(key, copy.deepcopy(result))
+    
+    def _cache_key(self, payload: Dict[str, Any]) -> Optional[str]:
+        """Digest identifying an agent run by model settings and input, or None when runs are not cached."""
+        if not self.cache_responses:
+            return None
+        return hashlib.blake2b(
+            f"{Config.MODEL_NAME}\0{Config.TEMPERATURE}\0{payload['input']}".encode(),
+            digest_size=16
+        ).hexdigest()
+    
+    async def _cached_ainvoke(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the agent executor, reusing the result of an identical earlier run when caching is on."""
+        key = self._cache_key(payload)
+        cached = self._cache.get(key) if key is not None else None
+        if cached is None:
+            cached = await self.agent_executor.ainvoke(payload)
+            if key is not None:
+                self._cache.put(key, cached)
+        # Callers get their own copy so they cannot alter the cached run
+        return copy.deepcopy(cached)
+    
+    async def _streamed_complete(self, prompt: ChatPromptTemplate, *, echo: bool = True,
+                                 **variables: str) -> Dict[str, Any]:
+        """Answer a tool-less prompt straight from the model, echoing tokens to stdout as they arrive.
         
-        print(f"Starting agentic workflow for repository: {repository_name}")
+        With echo=False the answer is only buffered, for runs whose output may be discarded.
+        The result has the same {input, output} shape as an agent run and shares its cache.
+        """
+        messages = prompt.format_messages(**variables)
+        key = self._cache_key({"input": "\0".join(message.content for message in messages)})
+        cached = self._cache.get(key) if key is not None else None
+        if cached is not None:
+            if echo:
+                _echo(cached["output"])
+            return copy.deepcopy(cached)
+        
+        chunks = []
+        async for chunk in self.llm.astream(messages):
+            if chunk.content:
+                if echo:
+                    _echo(chunk.content, end="")
+                chunks.append(chunk.content)
+        if echo:
+            _echo("")
+        
+        result = {"input": messages[-1].content, "output": "".join(chunks)}
+        if key is not None:
+            self._cache.put(key, result)
+        return copy.deepcopy(result)
+    
+    async def analyze_repository_workflow(self, repository_name: str,
+                                          documentation_url: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Complete workflow for analyzing a repository and its documentation.
+        
+        Yields {"step": ..., "result": ...} events as each step finishes; use
+        analyze_repository_workflow_collect() for a single result dict.
+        """
+        
+        logger.info(f"Starting agentic workflow for repository: {repository_name}")
+        
+        plan_key = self._plan_key("analyze_repository", repository_name.strip().lower(), (documentation_url or "").strip())
+        cached = self._get_plan(plan_key)
+        if cached is not None:
+            for step, result in cached.items():
+                yield {"step": step, "result": result}
+            return
+        
+        yield {"step": "repository", "result": repository_name}
         
         # Step 1: Analyze GitHub repository
-        print("\nStep 1: Analyzing GitHub repository...")
+        logger.info("\nStep 1: Analyzing GitHub repository...")
         github_query = f"repo:{repository_name}"
-        github_result = await self.agent_executor.ainvoke({"input": github_query})
+        github_task = self._cached_ainvoke({"input": github_query})
         
         # Step 2: Analyze documentation if provided
-        doc_result = None
         if documentation_url:
-            print(f"\nStep 2: Analyzing documentation from {documentation_url}...")
+            logger.info(f"\nStep 2: Analyzing documentation from {documentation_url}...")
             doc_query = f"Analyze the documentation at {documentation_url}"
-            doc_result = await self.agent_executor.ainvoke({"input": doc_query})
+            doc_task = self._cached_ainvoke({"input": doc_query})
+        else:
+            doc_task = _none()
         
-        # Step 3: Validate and reason about the data
-        print("\nStep 3: Validating and reasoning about the data...")
+        # Steps 1 and 2 are independent, so their round trips overlap
+        github_result, doc_result = await asyncio.gather(github_task, doc_task)
+        yield {"step": "github_analysis", "result": github_result}
+        yield {"step": "documentation_analysis", "result": doc_result}
         
-        # Prepare data for validation
-        validation_data = {
-            "github": {"repository": repository_name, "analysis": github_result},
-            "documentation": {"url": documentation_url, "analysis": doc_result} if documentation_url else None
+        # Structured facts carried to later steps instead of re-embedding whole outputs
+        memory = {
+            "repository": repository_name,
+            "doc_url": documentation_url,
+            "language": None,
+            "stars": None,
+            "forks": None,
+            "open_issues": None,
+            "doc_summary": None,
+            "confidence": None
         }
+        _fill_memory(memory, github_result, _GITHUB_SLOTS)
+        _fill_memory(memory, doc_result, _DOCUMENTATION_SLOTS)
         
-        validation_query = f"analyze:{json.dumps(validation_data)}"
-        validation_result = await self.agent_executor.ainvoke({"input": validation_query})
+        # Step 3: Validate and reason about the data
+        logger.info("\nStep 3: Validating and reasoning about the data...")
+        
+        # Later prompts are built from the memory slots; a step's (truncated) output is
+        # only added when its facts could not all be lifted out. The full results are
+        # kept for the returned dict
+        github_digest = None if _slots_filled(memory, _GITHUB_SLOTS) else _digest(github_result)
+        doc_digest = None if _slots_filled(memory, _DOCUMENTATION_SLOTS) else _digest(doc_result)
+        validation_data = {"facts": _render_memory(memory)}
+        if github_digest:
+            validation_data["github_analysis"] = github_digest
+        if doc_digest:
+            validation_data["documentation_analysis"] = doc_digest
+        
+        validation_query = f"analyze:{orjson.dumps(validation_data).decode()}"
+        validation_task = asyncio.create_task(self._cached_ainvoke({"input": validation_query}))
         
         # Step 4: Generate final recommendations
-        print("\nStep 4: Generating final recommendations...")
-        final_query = f"""
-        Based on the GitHub analysis and documentation analysis, provide:
-        1. A comprehensive summary of the repository
-        2. Key strengths and weaknesses
-        3. Actionable recommendations for improvement
-        4. Next steps for someone interested in this project
-        
-        GitHub Analysis: {github_result}
-        Documentation Analysis: {doc_result if doc_result else 'No documentation provided'}
-        Validation Results: {validation_result}
-        """
-        
-        final_result = await self.agent_executor.ainvoke({"input": final_query})
+        logger.info("\nStep 4: Generating final recommendations...")
+        
+        analyses = []
+        if github_digest:
+            analyses.append(f"\n\nGitHub Analysis: {github_digest}")
+        if doc_digest:
+            analyses.append(f"\n\nDocumentation Analysis: {doc_digest}")
+        elif not documentation_url:
+            analyses.append("\n\nDocumentation Analysis: No documentation provided")
+        final_variables = {
+            "facts": _render_memory(memory),
+            "analyses": "".join(analyses),
+            "validation": ""
+        }
         
-        return {
+        # Step 4 starts speculatively alongside Step 3 and is only redone when
+        # validation flags a problem. The speculative answer is buffered and shown
+        # once kept; a regenerated answer is streamed as it is written
+        final_task = asyncio.create_task(self._streamed_complete(_FINAL_PROMPT, echo=False, **final_variables))
+        try:
+            validation_result = await validation_task
+            yield {"step": "validation_results", "result": validation_result}
+            
+            _fill_memory(memory, validation_result, ("confidence",))
+            if _validation_flagged(validation_result["output"], memory["confidence"]):
+                final_task.cancel()
+                # The speculative outcome is discarded, whether cancelled, finished or failed
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await final_task
+                logger.info("\nValidation flagged problems; regenerating recommendations with its findings...")
+                final_variables["facts"] = _render_memory(memory)
+                final_variables["validation"] = f"\n\nValidation Results: {_digest(validation_result)}"
+                final_result = await self._streamed_complete(_FINAL_PROMPT, **final_variables)
+            else:
+                final_result = await final_task
+                _echo(final_result["output"])
+        finally:
+            # Also covers a failed validation run and a consumer that stops iterating
+            # before Step 4 is done; neither task may outlive the workflow
+            for task in (validation_task, final_task):
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await task
+        yield {"step": "final_recommendations", "result": final_result}
+        
+        self._put_plan(plan_key, {
             "repository": repository_name,
             "github_analysis": github_result,
             "documentation_analysis": doc_result,
             "validation_results": validation_result,
             "final_recommendations": final_result,
             "workflow_status": "completed"
-        }
+        })
+        yield {"step": "workflow_status", "result": "completed"}
     
-    async def search_and_analyze_workflow(self, search_query: str, max_repos: int = 3) -> Dict[str, Any]:
-        """Workflow for searching and analyzing multiple repositories."""
+    async def search_and_analyze_workflow(self, search_query: str, max_repos: int = 3) -> AsyncIterator[Dict[str, Any]]:
+        """Workflow for searching and analyzing multiple repositories.
+        
+        Yields {"step": ..., "result": ...} events as each step finishes; use
+        search_and_analyze_workflow_collect() for a single result dict.
+        """
         
-        print(f"Starting search and analysis workflow for: {search_query}")
+        logger.info(f"Starting search and analysis workflow for: {search_query}")
+        
+        plan_key = self._plan_key("search_and_analyze", _normalize(search_query).lower(), max_repos)
+        cached = self._get_plan(plan_key)
+        if cached is not None:
+            for step, result in cached.items():
+                yield {"step": step, "result": result}
+            return
+        
+        yield {"step": "search_query", "result": search_query}
         
         # Step 1: Search for repositories
-        print(f"\nStep 1: Searching for repositories matching '{search_query}'...")
+        logger.info(f"\nStep 1: Searching for repositories matching '{search_query}'...")
         search_query_formatted = f"search:{search_query}"
-        search_result = await self.agent_executor.ainvoke({"input": search_query_formatted})
+        search_result = await self._cached_ainvoke({"input": search_query_formatted})
+        yield {"step": "search_results", "result": search_result}
         
         # Step 2: Analyze top repositories
-        print(f"\nStep 2: Analyzing top {max_repos} repositories...")
-        analysis_results = []
+        logger.info(f"\nStep 2: Analyzing top {max_repos} repositories...")
         
         # Extract repository names from search results (simplified parsing)
-        repo_names = self._extract_repository_names(search_result, max_repos)
-        
-        for repo_name in repo_names:
-            print(f"\n  📋 Analyzing {repo_name}...")
-            repo_query = f"repo:{repo_name}"
-            repo_result = await self.agent_executor.ainvoke({"input": repo_query})
-            analysis_results.append({
+        repo_names = self._extract_repository_names(search_result["output"], max_repos)
+        
+        async def fetch_report(repo_name: str) -> str:
+            async with self._semaphore:
+                logger.info(f"\n  📋 Analyzing {repo_name}...")
+                return await self.github_tool.arun(f"repo:{repo_name}")
+        
+        # A repo: query only needs the GitHub tool's report summarized, so the tool is
+        # called directly and the summaries go out as one batch rather than an agent
+        # run (tool-selection call + summary call) per repository
+        reports = await asyncio.gather(*map(fetch_report, repo_names))
+        summaries = await self.llm.abatch(
+            [[HumanMessage(content=f"Summarize this GitHub repository analysis, highlighting project health:\n{report}")]
+             for report in reports],
+            config={"max_concurrency": Config.MAX_CONCURRENCY}
+        )
+        # abatch and gather keep results in search order
+        analysis_results = [
+            {
                 "repository": repo_name,
-                "analysis": repo_result
-            })
+                "analysis": {"input": f"repo:{repo_name}", "output": summary.content}
+            }
+            for repo_name, summary in zip(repo_names, summaries)
+        ]
+        yield {"step": "repository_analyses", "result": analysis_results}
         
         # Step 3: Compare and rank repositories
-        print(f"\nStep 3: Comparing and ranking repositories...")
+        logger.info(f"\nStep 3: Comparing and ranking repositories...")
         comparison_query = f"""
         Compare and rank the following repositories based on:
         1. Code quality indicators (stars, forks, issues)
@@ -173,42 +555,60 @@ Use these tools autonomously to complete the user's request."""),
         
         Provide a ranked list with reasoning for each ranking.
         
-        Repository Analyses: {json.dumps(analysis_results, indent=2)}
+        Repository Analyses: {orjson.dumps(analysis_results, option=orjson.OPT_INDENT_2).decode()}
         """
         
-        comparison_result = await self.agent_executor.ainvoke({"input": comparison_query})
+        comparison_result = await self._cached_ainvoke({"input": comparison_query})
+        yield {"step": "comparison_and_ranking", "result": comparison_result}
         
-        return {
+        self._put_plan(plan_key, {
             "search_query": search_query,
             "search_results": search_result,
             "repository_analyses": analysis_results,
             "comparison_and_ranking": comparison_result,
             "workflow_status": "completed"
-        }
+        })
+        yield {"step": "workflow_status", "result": "completed"}
     
     def _extract_repository_names(self, search_result: str, max_repos: int) -> List[str]:
         """Extract repository names from search results."""
         repo_names = []
+        seen = set()
         
-        # Simple extraction - look for patterns like "owner/repo"
-        import re
-        matches = re.findall(r'(\w+/\w+)', search_result)
-        
-        for match in matches[:max_repos]:
-            if match not in repo_names:
-                repo_names.append(match)
+        # Simple extraction - look for patterns like "owner/repo", stopping once enough are found
+        for match in _REPO_RE.finditer(search_result):
+            name = "/".join(part for part in match.groups() if part)
+            if name not in seen:
+                seen.add(name)
+                repo_names.append(name)
+                if len(repo_names) == max_repos:
+                    break
         
         return repo_names
     
-    async def autonomous_decision_workflow(self, context: str, decision_point: str) -> Dict[str, Any]:
-        """Workflow for autonomous decision making."""
+    async def autonomous_decision_workflow(self, context: str, decision_point: str) -> AsyncIterator[Dict[str, Any]]:
+        """Workflow for autonomous decision making.
+        
+        Yields {"step": ..., "result": ...} events as each step finishes; use
+        autonomous_decision_workflow_collect() for a single result dict.
+        """
+        
+        logger.info(f"Starting autonomous decision workflow...")
+        logger.info(f"Context: {context}")
+        logger.info(f"Decision Point: {decision_point}")
         
-        print(f"Starting autonomous decision workflow...")
-        print(f"Context: {context}")
-        print(f"Decision Point: {decision_point}")
+        plan_key = self._plan_key("autonomous_decision", _normalize(context), _normalize(decision_point))
+        cached = self._get_plan(plan_key)
+        if cached is not None:
+            for step, result in cached.items():
+                yield {"step": step, "result": result}
+            return
+        
+        yield {"step": "context", "result": context}
+        yield {"step": "decision_point", "result": decision_point}
         
         # Step 1: Gather relevant information
-        print(f"\nStep 1: Gathering relevant information...")
+        logger.info(f"\nStep 1: Gathering relevant information...")
         info_query = f"""
         Based on the context and decision point, identify what information would be helpful:
         
@@ -218,15 +618,20 @@ Use these tools autonomously to complete the user's request."""),
         Suggest what data or analysis would be most valuable for making this decision.
         """
         
-        info_result = await self.agent_executor.ainvoke({"input": info_query})
+        info_task = self._cached_ainvoke({"input": info_query})
         
         # Step 2: Apply reasoning
-        print(f"\nStep 2: Applying logical reasoning...")
+        logger.info(f"\nStep 2: Applying logical reasoning...")
         reasoning_query = f"reason:{context}\n\nDecision Point: {decision_point}"
-        reasoning_result = await self.agent_executor.ainvoke({"input": reasoning_query})
+        reasoning_task = self._cached_ainvoke({"input": reasoning_query})
+        
+        # Steps 1 and 2 only read the context and decision point, so their round trips overlap
+        info_result, reasoning_result = await asyncio.gather(info_task, reasoning_task)
+        yield {"step": "information_gathering", "result": info_result}
+        yield {"step": "reasoning_analysis", "result": reasoning_result}
         
         # Step 3: Generate decision and rationale
-        print(f"\nStep 3: Generating decision and rationale...")
+        logger.info(f"\nStep 3: Generating decision and rationale...")
         decision_query = f"""
         Based on the context, decision point, and reasoning analysis, provide:
         1. A clear decision or recommendation
@@ -240,16 +645,31 @@ Use these tools autonomously to complete the user's request."""),
         Reasoning Analysis: {reasoning_result}
         """
         
-        decision_result = await self.agent_executor.ainvoke({"input": decision_query})
+        decision_result = await self._cached_ainvoke({"input": decision_query})
+        yield {"step": "decision_and_rationale", "result": decision_result}
         
-        return {
+        self._put_plan(plan_key, {
             "context": context,
             "decision_point": decision_point,
             "information_gathering": info_result,
             "reasoning_analysis": reasoning_result,
             "decision_and_rationale": decision_result,
             "workflow_status": "completed"
-        }
+        })
+        yield {"step": "workflow_status", "result": "completed"}
+    
+    async def analyze_repository_workflow_collect(self, repository_name: str,
+                                                  documentation_url: Optional[str] = None) -> Dict[str, Any]:
+        """Run analyze_repository_workflow to completion and return its results as one dict."""
+        return await _collect(self.analyze_repository_workflow(repository_name, documentation_url))
+    
+    async def search_and_analyze_workflow_collect(self, search_query: str, max_repos: int = 3) -> Dict[str, Any]:
+        """Run search_and_analyze_workflow to completion and return its results as one dict."""
+        return await _collect(self.search_and_analyze_workflow(search_query, max_repos))
+    
+    async def autonomous_decision_workflow_collect(self, context: str, decision_point: str) -> Dict[str, Any]:
+        """Run autonomous_decision_workflow to completion and return its results as one dict."""
+        return await _collect(self.autonomous_decision_workflow(context, decision_point))
 
 
 async def main():
@@ -258,64 +678,74 @@ async def main():
     print("🌟 CloudBees Agentic Workflow Demo")
     print("=" * 50)
     
-    # Initialize orchestrator
+    # Initialize orchestrator; from here on output goes through the log queue,
+    # so it stays in order with the workflows' log lines and streamed answers
     orchestrator = AgenticWorkflowOrchestrator()
     
     # Example 1: Analyze a specific repository
-    print("\nExample 1: Repository Analysis Workflow")
-    print("-" * 40)
+    _echo("\nExample 1: Repository Analysis Workflow")
+    _echo("-" * 40)
     
     try:
-        result1 = await orchestrator.analyze_repository_workflow(
+        result1 = await orchestrator.analyze_repository_workflow_collect(
             repository_name="microsoft/vscode",
             documentation_url="https://code.visualstudio.com/docs"
         )
         
-        print("\nRepository Analysis Complete!")
-        print(f"Repository: {result1['repository']}")
-        print(f"Status: {result1['workflow_status']}")
+        _echo("\nRepository Analysis Complete!")
+        _echo(f"Repository: {result1['repository']}")
+        _echo(f"Status: {result1['workflow_status']}")
         
     except Exception as e:
-        print(f"Error in repository analysis: {e}")
+        _echo(f"Error in repository analysis: {e}")
     
     # Example 2: Search and analyze multiple repositories
-    print("\nExample 2: Search and Analysis Workflow")
-    print("-" * 40)
+    _echo("\nExample 2: Search and Analysis Workflow")
+    _echo("-" * 40)
     
     try:
-        result2 = await orchestrator.search_and_analyze_workflow(
+        result2 = await orchestrator.search_and_analyze_workflow_collect(
             search_query="python web framework",
             max_repos=2
         )
         
-        print("\nSearch and Analysis Complete!")
-        print(f"Search Query: {result2['search_query']}")
-        print(f"Status: {result2['workflow_status']}")
+        _echo("\nSearch and Analysis Complete!")
+        _echo(f"Search Query: {result2['search_query']}")
+        _echo(f"Status: {result2['workflow_status']}")
         
     except Exception as e:
-        print(f"Error in search and analysis: {e}")
+        _echo(f"Error in search and analysis: {e}")
     
     # Example 3: Autonomous decision making
-    print("\nExample 3: Autonomous Decision Workflow")
-    print("-" * 40)
+    _echo("\nExample 3: Autonomous Decision Workflow")
+    _echo("-" * 40)
     
     try:
-        result3 = await orchestrator.autonomous_decision_workflow(
+        result3 = await orchestrator.autonomous_decision_workflow_collect(
             context="A development team is considering adopting a new JavaScript framework for their web application. They currently use React but are interested in exploring alternatives like Vue.js or Svelte. The team has 5 developers with varying levels of experience.",
             decision_point="Should the team adopt Vue.js, Svelte, or stick with React?"
         )
         
-        print("\nAutonomous Decision Complete!")
-        print(f"Decision Point: {result3['decision_point']}")
-        print(f"Status: {result3['workflow_status']}")
+        _echo("\nAutonomous Decision Complete!")
+        _echo(f"Decision Point: {result3['decision_point']}")
+        _echo(f"Status: {result3['workflow_status']}")
         
     except Exception as e:
-        print(f"Error in autonomous decision: {e}")
+        _echo(f"Error in autonomous decision: {e}")
     
-    print("\nAgentic Workflow Demo Complete!")
-    print("=" * 50)
+    # Release pooled HTTP connections before the event loop shuts down
+    await orchestrator.aclose()
+    
+    _echo("\nAgentic Workflow Demo Complete!")
+    _echo("=" * 50)
 
 
 if __name__ == "__main__":
+    # uvloop runs the event loop in C; it is optional, so fall back to asyncio's default
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     # Run the main function
     asyncio.run(main())